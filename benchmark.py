@@ -0,0 +1,231 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import crosswordGenerator
+import crosswordGenerator2
+
+# engines of "crosswordGenerator2.searchEngines" run with other settings, as (engine, settings), by name
+engineVariants = {'dfsHeuristic': ('dfs', {'heuristicOrder': True})}
+# engines benchmarked by default: 'v1' is "generateCrosswords" of crosswordGenerator.py (the search behind
+# "crossword"), the others are the engines of "crosswordGenerator2.searchEngines" that take a search mode (the beam
+# search finds good crosswords, not every crossword, so its counts cannot be compared), and their variants
+defaultEngines = ['v1'] + [engine for engine, engineClass in crosswordGenerator2.searchEngines.items()
+                           if 'searchMode' in engineClass.searchParameters] + list(engineVariants)
+# rules of the crosswords each engine accepts: v1 accepts any grid whose runs are all words of the list, the others
+# read every word back as its own run, so they find fewer crosswords where a run is a second copy of a word
+engineRules = {'v1': 'v1'}
+# word lists longer than this are skipped for an engine (the v1 search runs one DFS per order of the words)
+engineMaxWords = {'v1': 7, 'exactCover': 7}
+searchModes = ['ALL', 'FAST', 'IDEAL']
+# results that must not depend on the engine, per search mode: 'FAST' searches may stop at crosswords of any size, and
+# 'IDEAL' searches may yield a different number of ever smaller crosswords before the smallest one
+comparedResults = {'ALL': ('solutions', 'bestSize'), 'FAST': ('solutions',), 'IDEAL': ('bestSize',)}
+# a measure is a regression if it is more than this fraction above the baseline...
+tolerances = {'wallSeconds': 0.25, 'nodesExpanded': 0.0, 'peakMemoryBytes': 0.25}
+# ...and, for the noisy measures, more than this far above it
+minimumChanges = {'wallSeconds': 0.05, 'nodesExpanded': 0, 'peakMemoryBytes': 1 << 20}
+
+
+def loadJson(path):
+    '''
+    :param path: str - path of a JSON file
+    :return: the decoded JSON document
+    '''
+    with open(path) as jsonFile:
+        return json.load(jsonFile)
+
+
+def runEngine(engine, words, searchMode):
+    '''
+    Runs one search to completion.
+    :param engine: str - 'v1', the name of an engine in "crosswordGenerator2.searchEngines", or of a variant in
+                         "engineVariants"
+    :param words: list - words to be inserted into the crossword
+    :param searchMode: str - 'ALL', 'FAST' or 'IDEAL'
+    :return: tuple - (sizes of the crosswords found, in the order they were found; partial crosswords expanded)
+    '''
+    if engine == 'v1':
+        stats = {}
+        sizes = [grid[0] for grid in crosswordGenerator.generateCrosswords(words, searchMode, stats=stats)]
+        return sizes, sum(stats['nodesPerDepth'].values())
+    engine, searchOptions = engineVariants.get(engine, (engine, {}))
+    engineClass = crosswordGenerator2.searchEngines[engine]
+    if 'searchMode' in engineClass.searchParameters:
+        searchOptions = dict(searchOptions, searchMode=searchMode)
+    search = engineClass(words, **searchOptions)
+    sizes = [crossword.getSize() for crossword in search.search()]
+    return sizes, search.nodesExpanded
+
+
+def measureRun(engine, words, searchMode, repeats, measureMemory):
+    '''
+    Benchmarks one search. The wall time is the best of "repeats" runs; the peak memory is measured in one more run,
+    as tracing the allocations slows the search down.
+    :param engine: str - name of the engine (see "runEngine")
+    :param words: list - words to be inserted into the crossword
+    :param searchMode: str - 'ALL', 'FAST' or 'IDEAL'
+    :param repeats: int - number of timed runs
+    :param measureMemory: bool - if True, also measure the peak memory
+    :return: dict - the measures of the search
+    '''
+    wallSeconds = None
+    for repeat in range(repeats):
+        startTime = time.perf_counter()
+        sizes, nodesExpanded = runEngine(engine, words, searchMode)
+        elapsedSeconds = time.perf_counter() - startTime
+        if wallSeconds is None or elapsedSeconds < wallSeconds:
+            wallSeconds = elapsedSeconds
+    peakMemoryBytes = None
+    if measureMemory:
+        tracemalloc.start()
+        runEngine(engine, words, searchMode)
+        peakMemoryBytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {'wallSeconds': round(wallSeconds, 4), 'nodesExpanded': nodesExpanded,
+            'peakMemoryBytes': peakMemoryBytes, 'solutions': len(sizes), 'bestSize': min(sizes, default=None)}
+
+
+def findMismatches(results, wordList):
+    '''
+    Checks that every engine found the same crosswords for a word list ("comparedResults"), and found crosswords if
+    and only if the list is solvable. A list with 'baselineSolutions' (the number of crosswords the original
+    crosswordGenerator.py and crosswordGenerator2.py found in 'ALL' mode, under 'v1' and 'v2') is one where the rules
+    of the engines ("engineRules") give different crosswords: its engines are only compared with the engines of the
+    same rules, and with the original script.
+    :param results: list - result dicts of the word list
+    :param wordList: dict - the word list, as stored in the corpus
+    :return: list - a description of every mismatch
+    '''
+    mismatches = []
+    baselineSolutions = wordList.get('baselineSolutions')
+    for searchMode in searchModes:
+        modeResults = [result for result in results if result['mode'] == searchMode]
+        ruleGroups = {}
+        for result in modeResults:
+            rules = engineRules.get(result['engine'], 'v2') if baselineSolutions else None
+            ruleGroups.setdefault(rules, []).append(result)
+        for groupResults in ruleGroups.values():
+            for key in comparedResults[searchMode]:
+                values = {result['engine']: result[key] for result in groupResults}
+                if len(set(values.values())) > 1:
+                    mismatches.append({'list': wordList['name'], 'mode': searchMode, 'measure': key,
+                                       'values': values})
+        for result in modeResults:
+            if searchMode == 'ALL' and baselineSolutions and \
+                    result['solutions'] != baselineSolutions[engineRules.get(result['engine'], 'v2')]:
+                mismatches.append({'list': wordList['name'], 'mode': searchMode, 'measure': 'baselineSolutions',
+                                   'values': {result['engine']: result['solutions']}})
+            if (result['solutions'] > 0) != wordList['solvable']:
+                mismatches.append({'list': wordList['name'], 'mode': searchMode, 'measure': 'solvable',
+                                   'values': {result['engine']: result['solutions']}})
+    return mismatches
+
+
+def findRegressions(report, baseline):
+    '''
+    Compares the measures of a report with those of a baseline report of the same corpus version. A change in the
+    results of "comparedResults" is always a regression; the wall time, the partial crosswords expanded and the
+    peak memory are regressions if they grew beyond "tolerances" and "minimumChanges".
+    :param report: dict - the report of this run
+    :param baseline: dict - the baseline report
+    :return: list - a description of every regression
+    '''
+    if baseline['corpusVersion'] != report['corpusVersion']:
+        return [{'measure': 'corpusVersion', 'baseline': baseline['corpusVersion'],
+                 'current': report['corpusVersion']}]
+    baselineResults = {(result['list'], result['engine'], result['mode']): result for result in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        baselineResult = baselineResults.get((result['list'], result['engine'], result['mode']))
+        if baselineResult is None:
+            continue
+        changes = {}
+        for measure in comparedResults[result['mode']]:
+            if result[measure] != baselineResult[measure]:
+                changes[measure] = (baselineResult[measure], result[measure])
+        for measure, tolerance in tolerances.items():
+            # if the measure was not taken in both runs
+            if result[measure] is None or baselineResult[measure] is None:
+                continue
+            if result[measure] > baselineResult[measure] * (1 + tolerance) and \
+                    result[measure] - baselineResult[measure] > minimumChanges[measure]:
+                changes[measure] = (baselineResult[measure], result[measure])
+        for measure, (baselineValue, currentValue) in changes.items():
+            regressions.append({'list': result['list'], 'engine': result['engine'], 'mode': result['mode'],
+                                'measure': measure, 'baseline': baselineValue, 'current': currentValue})
+    return regressions
+
+
+def runBenchmark(corpus, engines=None, modes=None, listNames=None, repeats=3, measureMemory=True):
+    '''
+    Runs every engine in every mode on every word list of the corpus.
+    :param corpus: dict - the corpus: {'version': int, 'wordLists': [{'name', 'solvable', 'words'}, ...]} (a word
+                          list may also have 'baselineSolutions', see "findMismatches")
+    :param engines: list - names of the engines to run (None for "defaultEngines")
+    :param modes: list - search modes to run (None for every mode)
+    :param listNames: list - names of the word lists to run (None for every list)
+    :param repeats: int - number of timed runs of every search
+    :param measureMemory: bool - if True, also measure the peak memory of every search
+    :return: dict - the report: corpus version, environment, one result per search, mismatches between engines
+    '''
+    engines = engines or defaultEngines
+    modes = modes or searchModes
+    report = {'corpusVersion': corpus['version'], 'python': platform.python_version(),
+              'machine': platform.machine(), 'repeats': repeats, 'results': [], 'mismatches': []}
+    for wordList in corpus['wordLists']:
+        if listNames is not None and wordList['name'] not in listNames:
+            continue
+        listResults = []
+        for engine in engines:
+            # if the list is too long for the engine to finish in reasonable time
+            if len(wordList['words']) > engineMaxWords.get(engine, len(wordList['words'])):
+                continue
+            for searchMode in modes:
+                print(wordList['name'], engine, searchMode, file=sys.stderr, flush=True)
+                result = {'list': wordList['name'], 'words': len(wordList['words']), 'engine': engine,
+                          'mode': searchMode}
+                result.update(measureRun(engine, wordList['words'], searchMode, repeats, measureMemory))
+                listResults.append(result)
+        report['results'] += listResults
+        report['mismatches'] += findMismatches(listResults, wordList)
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks the crossword search engines on a fixed corpus of word '
+                                                 'lists, and reports the measures as JSON.')
+    parser.add_argument('--corpus', default='benchmarkCorpus.json', help='corpus of word lists')
+    parser.add_argument('--engines', nargs='+', default=defaultEngines, choices=defaultEngines,
+                        help='engines to run')
+    parser.add_argument('--modes', nargs='+', default=searchModes, choices=searchModes, help='search modes to run')
+    parser.add_argument('--lists', nargs='+', help='names of the word lists to run (default: all)')
+    parser.add_argument('--repeats', type=int, default=3, help='timed runs per search (the best one is kept)')
+    parser.add_argument('--no-memory', dest='measureMemory', action='store_false',
+                        help='do not measure the peak memory')
+    parser.add_argument('--baseline', default='benchmarkBaseline.json', help='baseline report to compare with')
+    parser.add_argument('--save-baseline', dest='saveBaseline', action='store_true',
+                        help='store this report as the baseline instead of comparing with it')
+    parser.add_argument('--output', help='file to write the report to (default: standard output)')
+    arguments = parser.parse_args()
+
+    benchmarkReport = runBenchmark(loadJson(arguments.corpus), arguments.engines, arguments.modes, arguments.lists,
+                                   arguments.repeats, arguments.measureMemory)
+    if arguments.saveBaseline:
+        with open(arguments.baseline, 'w') as baselineFile:
+            json.dump(benchmarkReport, baselineFile, indent=1)
+    else:
+        try:
+            benchmarkReport['regressions'] = findRegressions(benchmarkReport, loadJson(arguments.baseline))
+        except FileNotFoundError:
+            benchmarkReport['regressions'] = None
+    reportText = json.dumps(benchmarkReport, indent=1)
+    if arguments.output:
+        with open(arguments.output, 'w') as outputFile:
+            outputFile.write(reportText + '\n')
+    else:
+        print(reportText)
+    # a failing exit status lets scripts catch engines disagreeing, and regressions
+    sys.exit(1 if benchmarkReport['mismatches'] or benchmarkReport.get('regressions') else 0)
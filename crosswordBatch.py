@@ -0,0 +1,247 @@
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import sys
+import time
+import crosswordCache
+import crosswordGenerator2
+
+searchModes = ['ALL', 'FAST', 'IDEAL']
+# keys of a JSON input object that describe the item; its other keys are passed on to the engine (e.g. maxHeight)
+itemKeys = ('id', 'words', 'mode', 'engine')
+# seconds to wait for an item beyond its timeout before giving up on it and stopping its worker (the engines only
+# check their time budget every so many nodes, and the item may have waited for a worker)
+timeoutGrace = 30
+
+
+def parseLine(line, lineNumber, inputFormat='auto'):
+    '''
+    Reads one input item. A text line holds the words separated by commas and/or spaces (as typed into
+    crosswordGenerator.py); a JSON line holds either a list of words or an object with the key 'words' and optionally
+    'id', 'mode', 'engine' and settings of the engine.
+    :param line: str - the line, without its line break
+    :param lineNumber: int - number of the line in the input, from 1
+    :param inputFormat: str - 'text', 'jsonl', or 'auto' to read lines starting with '[' or '{' as JSON
+    :return: dict - the item: 'id' (the line number unless given), 'line', 'words', and the other keys of a JSON
+                    object; or 'id', 'line' and 'error' if the line cannot be read
+    '''
+    item = {'id': lineNumber, 'line': lineNumber}
+    if inputFormat == 'text' or (inputFormat == 'auto' and not line.lstrip().startswith(('[', '{'))):
+        item['words'] = line.replace(',', ' ').split()
+        return item
+    try:
+        document = json.loads(line)
+    except ValueError as error:
+        item['error'] = 'invalid JSON: ' + str(error)
+        return item
+    if isinstance(document, list):
+        document = {'words': document}
+    if not isinstance(document, dict) or not isinstance(document.get('words'), list) or \
+            not all(isinstance(word, str) for word in document['words']):
+        item['error'] = 'expected a list of words, or an object with a list of words under "words"'
+        return item
+    item.update(document)
+    return item
+
+
+def readItems(inputFile, inputFormat='auto'):
+    '''
+    Reads the input items lazily, skipping blank lines.
+    :param inputFile: file object - the input
+    :param inputFormat: str - 'text', 'jsonl' or 'auto' (see "parseLine")
+    :return: generator of item dicts
+    '''
+    for lineNumber, line in enumerate(inputFile, 1):
+        if line.strip():
+            yield parseLine(line.rstrip('\n'), lineNumber, inputFormat)
+
+
+def newRecord(item, searchMode, engine):
+    '''
+    :param item: dict - the item (see "parseLine")
+    :param searchMode: str - search mode of the item, unless it gives its own
+    :param engine: str - search engine of the item, unless it gives its own
+    :return: dict - the output record of the item, as if it had failed (see "solveItem")
+    '''
+    return {'id': item['id'], 'line': item['line'], 'words': item.get('words'), 'mode': item.get('mode', searchMode),
+            'engine': item.get('engine', engine), 'status': 'error', 'stopReason': None, 'infeasibility': None,
+            'solutions': 0, 'size': None, 'layouts': [], 'nodesExpanded': 0, 'cacheHit': False, 'seconds': 0.0,
+            'timeoutEnforced': False, 'error': item.get('error')}
+
+
+def initializeWorker(cachePath):
+    '''
+    Sets up a worker process of the batch.
+    :param cachePath: str - path of the result cache shared by the workers (None for no cache)
+    :return: None
+    '''
+    global resultCache
+    resultCache = crosswordCache.ResultCache(cachePath) if cachePath is not None else None
+
+
+def solveItem(item, searchMode, engine, timeout, maxNodes, maxLayouts):
+    '''
+    Task of a worker process: searches the crosswords of one item. Any error is reported in the record, so one item
+    cannot stop the batch.
+    :param item: dict - the item (see "parseLine")
+    :param searchMode: str - 'ALL', 'FAST' or 'IDEAL', unless the item gives its own
+    :param engine: str - name of the search engine in "crosswordGenerator2.searchEngines", unless the item gives its
+                         own
+    :param timeout: float - seconds after which the search stops, keeping the crosswords found so far (None for no
+                            limit)
+    :param maxNodes: int - partial crosswords after which the search stops (None for no limit)
+    :param maxLayouts: int - maximum number of layouts in the record (None for all of them)
+    :return: dict - the output record: 'id', 'line', 'words', 'mode', 'engine', 'status' ('ok', 'noCrossword',
+                    'timeout', 'stopped' or 'error'), 'stopReason', 'infeasibility', 'solutions', 'size' (of the
+                    smallest crossword), 'layouts' (rows of each crossword, smallest first), 'nodesExpanded',
+                    'cacheHit', 'seconds', 'timeoutEnforced' (True if the item did not return in time and its
+                    worker was stopped, see "runBatch") and 'error'
+    '''
+    record = newRecord(item, searchMode, engine)
+    if record['error'] is not None:
+        return record
+    if record['mode'] not in searchModes:
+        record['error'] = 'unknown search mode: ' + str(record['mode'])
+        return record
+    startTime = time.perf_counter()
+    try:
+        searchOptions = {option: value for option, value in item.items() if option not in itemKeys + ('line',)}
+        # budgets are only passed on if they are set, so an item can give its own
+        if timeout is not None:
+            searchOptions.setdefault('maxSeconds', timeout)
+        if maxNodes is not None:
+            searchOptions.setdefault('maxNodes', maxNodes)
+        if resultCache is not None:
+            search = crosswordCache.CachedSearch(record['words'], resultCache, record['mode'], engine=record['engine'],
+                                                 **searchOptions)
+        else:
+            engineClass = crosswordGenerator2.searchEngines[record['engine']]
+            if 'searchMode' in engineClass.searchParameters:
+                searchOptions['searchMode'] = record['mode']
+            search = engineClass(record['words'], **searchOptions)
+        crosswords = sorted(search.search(), key=lambda crossword: crossword.getSize())
+        record['stopReason'] = search.stopReason
+        record['infeasibility'] = search.infeasibility
+        record['solutions'] = len(crosswords)
+        record['size'] = crosswords[0].getSize() if crosswords else None
+        record['layouts'] = [list(crossword.getRows()) for crossword in crosswords[:maxLayouts]]
+        record['nodesExpanded'] = search.nodesExpanded
+        record['cacheHit'] = getattr(search, 'cacheHit', False)
+        record['error'] = None
+        if search.stopReason == 'maxSeconds':
+            record['status'] = 'timeout'
+        elif search.stopReason in ('maxNodes', 'cancelled', 'tooLarge'):
+            record['status'] = 'stopped'
+        else:
+            record['status'] = 'ok' if crosswords else 'noCrossword'
+    except Exception as error:
+        record['error'] = type(error).__name__ + ': ' + str(error)
+    record['seconds'] = round(time.perf_counter() - startTime, 4)
+    return record
+
+
+def runBatch(items, outputFile, workers=None, maxPending=None, searchMode='ALL', engine='dfs', timeout=None,
+             maxNodes=None, maxLayouts=None, cachePath=None):
+    '''
+    Solves the items across a pool of worker processes and writes one JSON record per item, in input order. At most
+    maxPending items are read ahead of the oldest unfinished one, so memory stays bounded however long the input is.
+    An item that has not returned timeoutGrace seconds after its timeout gets a 'timeout' record, and the batch goes
+    on: the pool is replaced by a new one, which stops the worker stuck on the item, and the other unfinished items
+    are started again on the new pool.
+    :param items: iterable of item dicts (see "readItems")
+    :param outputFile: file object - where the records are written, one per line
+    :param workers: int - number of worker processes (None for one per CPU)
+    :param maxPending: int - maximum number of items read but not yet written (None for twice the workers)
+    :param searchMode: str - default search mode of the items
+    :param engine: str - default search engine of the items
+    :param timeout: float - seconds each item may search for (None for no limit)
+    :param maxNodes: int - partial crosswords each item may expand (None for no limit)
+    :param maxLayouts: int - maximum number of layouts per record (None for all of them)
+    :param cachePath: str - path of a result cache shared by the workers (None for no cache)
+    :return: collections.Counter - number of records of each status
+    '''
+    workers = workers or os.cpu_count() or 1
+    maxPending = maxPending or 2 * workers
+    statusCounts = collections.Counter()
+    pool = multiprocessing.Pool(workers, initializer=initializeWorker, initargs=(cachePath,))
+    pending = collections.deque()
+
+    def startItem(item):
+        return pool.apply_async(solveItem, (item, searchMode, engine, timeout, maxNodes, maxLayouts))
+
+    def writeOldest():
+        nonlocal pool, pending
+        item, result = pending.popleft()
+        try:
+            record = result.get(timeout=None if timeout is None else timeout + timeoutGrace)
+        except multiprocessing.TimeoutError:
+            record = newRecord(item, searchMode, engine)
+            record['status'] = 'timeout'
+            record['timeoutEnforced'] = True
+            record['error'] = 'no result ' + str(timeoutGrace) + ' seconds after the timeout; its worker was stopped'
+            # a task cannot be stopped on its own, so the whole pool is replaced, and the items it had not finished
+            # are started again
+            pool.terminate()
+            pool.join()
+            pool = multiprocessing.Pool(workers, initializer=initializeWorker, initargs=(cachePath,))
+            pending = collections.deque([(otherItem, otherResult if otherResult.ready() else startItem(otherItem))
+                                         for otherItem, otherResult in pending])
+        except Exception as error:
+            # e.g. the task could not be sent to the worker process
+            record = newRecord(item, searchMode, engine)
+            record['error'] = type(error).__name__ + ': ' + str(error)
+        statusCounts[record['status']] += 1
+        outputFile.write(json.dumps(record) + '\n')
+        outputFile.flush()
+
+    try:
+        for item in items:
+            # if too many items are in flight, wait for the oldest one before reading more
+            if len(pending) >= maxPending:
+                writeOldest()
+            pending.append((item, startItem(item)))
+        while pending:
+            writeOldest()
+    finally:
+        pool.terminate()
+        pool.join()
+    return statusCounts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Solves a stream of word lists across a pool of worker processes, '
+                                                 'and writes one JSON record per list.')
+    parser.add_argument('--input', default='-', help='file of word lists, one per line (default: standard input)')
+    parser.add_argument('--format', dest='inputFormat', default='auto', choices=['auto', 'jsonl', 'text'],
+                        help='format of the lines: JSON, words separated by commas/spaces, or detected per line')
+    parser.add_argument('--output', help='file to write the records to (default: standard output)')
+    parser.add_argument('--mode', default='ALL', choices=searchModes, help='search mode of the lists')
+    parser.add_argument('--engine', default='dfs', choices=list(crosswordGenerator2.searchEngines),
+                        help='search engine of the lists')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('--max-pending', dest='maxPending', type=int,
+                        help='lists read ahead of the oldest unfinished one (default: twice the workers)')
+    parser.add_argument('--timeout', type=float, help='seconds each list may search for (default: no limit)')
+    parser.add_argument('--max-nodes', dest='maxNodes', type=int,
+                        help='partial crosswords each list may expand (default: no limit)')
+    parser.add_argument('--max-layouts', dest='maxLayouts', type=int,
+                        help='layouts per record, smallest first (default: all)')
+    parser.add_argument('--cache', dest='cachePath', help='result cache shared by the workers (default: none)')
+    arguments = parser.parse_args()
+
+    inputFile = sys.stdin if arguments.input == '-' else open(arguments.input)
+    outputFile = open(arguments.output, 'w') if arguments.output else sys.stdout
+    try:
+        batchCounts = runBatch(readItems(inputFile, arguments.inputFormat), outputFile, arguments.workers,
+                               arguments.maxPending, arguments.mode, arguments.engine, arguments.timeout,
+                               arguments.maxNodes, arguments.maxLayouts, arguments.cachePath)
+    finally:
+        if inputFile is not sys.stdin:
+            inputFile.close()
+        if outputFile is not sys.stdout:
+            outputFile.close()
+    print(', '.join([status + ': ' + str(count) for status, count in sorted(batchCounts.items())]), file=sys.stderr)
+    # a failing exit status lets scripts catch lists that could not be solved because of an error
+    sys.exit(1 if batchCounts['error'] else 0)
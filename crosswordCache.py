@@ -0,0 +1,218 @@
+import argparse
+import json
+import os
+import sqlite3
+import time
+import crosswordGenerator2
+
+# bumped whenever the stored results would no longer match what the engines return
+cacheVersion = 1
+# settings of the engines that only change how far a search may go, or how it reports its progress: a search that
+# finished returns the same crosswords whatever they were, so they are not part of the key
+uncachedOptions = ('maxNodes', 'maxSeconds', 'cancelEvent', 'progressCallback', 'progressInterval', 'collectStats')
+# stop reasons of the searches whose results are stored (the others stopped early, so their results are incomplete)
+cachedStopReasons = ('completed', 'found', 'infeasible')
+
+
+def cacheKey(words, searchMode, engine, searchOptions):
+    '''
+    Key of a search request. Lists with the same words in any order and case are the same request, and so are
+    requests that only differ in the order of the search (orderIndependent, workers, heuristicOrder): any result they
+    return is a correct answer to the request.
+    :param words: list - words to be inserted into the crossword, in any order and case
+    :param searchMode: str - 'ALL', 'FAST' or 'IDEAL'
+    :param engine: str - name of the search engine in "crosswordGenerator2.searchEngines"
+    :param searchOptions: dict - other settings of the engine (e.g. maxHeight, maxWidth)
+    :return: str - the key, as canonical JSON
+    '''
+    options = {option: value for option, value in searchOptions.items()
+               if option not in uncachedOptions + ('orderIndependent', 'workers', 'heuristicOrder')}
+    return json.dumps([cacheVersion, sorted([word.upper() for word in words]), searchMode, engine, options],
+                      sort_keys=True, separators=(',', ':'))
+
+
+class ResultCache(object):
+    def __init__(self, path='crosswordCache.sqlite', maxBytes=64 << 20):
+        '''
+        Disk cache of search results, shared by every process using the same file. Results are stored in an SQLite
+        database in write-ahead-log mode, so readers do not block the writer, and every write is one transaction, so
+        processes reading and writing at once always see whole results. Once the stored results take more than
+        maxBytes, the least recently used ones are evicted.
+        :param path: str - path of the database file (created if it does not exist)
+        :param maxBytes: int - maximum size of the stored results
+        '''
+        self.path = path
+        self.maxBytes = maxBytes
+        # connections cannot be shared with child processes, so each process opens its own
+        self.connection = None
+        self.connectionPid = None
+
+    def connect(self):
+        '''
+        :return: sqlite3.Connection - the connection of this process, opened (and the table created) on first use
+        '''
+        if self.connection is None or self.connectionPid != os.getpid():
+            # autocommit mode: transactions are opened explicitly, so writes can take the write lock up front
+            self.connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, stopReason TEXT, '
+                                    'infeasibility TEXT, crosswords TEXT, bytes INTEGER, lastUsed REAL)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS resultsLastUsed ON results (lastUsed)')
+            self.connectionPid = os.getpid()
+        return self.connection
+
+    def lookup(self, key):
+        '''
+        :param key: str - key of the request (see "cacheKey")
+        :return: tuple - (stop reason, infeasibility, list of the placed words of every crossword), or None if the
+                         request is not in the cache
+        '''
+        connection = self.connect()
+        row = connection.execute('SELECT stopReason, infeasibility, crosswords FROM results WHERE key = ?',
+                                 (key,)).fetchone()
+        if row is None:
+            return None
+        connection.execute('UPDATE results SET lastUsed = ? WHERE key = ?', (time.time(), key))
+        stopReason, infeasibility, crosswords = row
+        return stopReason, infeasibility, [[(word, tuple(position), orientation)
+                                            for word, position, orientation in placements]
+                                           for placements in json.loads(crosswords)]
+
+    def store(self, key, stopReason, infeasibility, crosswords):
+        '''
+        Stores the result of a request, then evicts the least recently used results until the cache fits maxBytes
+        again. A result larger than maxBytes on its own is not stored.
+        :param key: str - key of the request (see "cacheKey")
+        :param stopReason: str - why the search stopped
+        :param infeasibility: str - why the words can never form a crossword (None if no reason was found)
+        :param crosswords: list - the placed words of every crossword of the result (see "Crossword.getPlacedWords")
+        :return: None
+        '''
+        crosswordsText = json.dumps(crosswords, separators=(',', ':'))
+        resultBytes = len(key) + len(crosswordsText)
+        if resultBytes > self.maxBytes:
+            return
+        connection = self.connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                               (key, stopReason, infeasibility, crosswordsText, resultBytes, time.time()))
+            excessBytes = connection.execute('SELECT TOTAL(bytes) FROM results').fetchone()[0] - self.maxBytes
+            if excessBytes > 0:
+                evictedKeys = []
+                for evictedKey, evictedBytes in connection.execute('SELECT key, bytes FROM results '
+                                                                   'ORDER BY lastUsed'):
+                    if excessBytes <= 0:
+                        break
+                    evictedKeys.append((evictedKey,))
+                    excessBytes -= evictedBytes
+                connection.executemany('DELETE FROM results WHERE key = ?', evictedKeys)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def clear(self):
+        '''
+        Evicts every result.
+        :return: None
+        '''
+        self.connect().execute('DELETE FROM results')
+
+    def getEntryCount(self):
+        return self.connect().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+    def getTotalBytes(self):
+        return int(self.connect().execute('SELECT TOTAL(bytes) FROM results').fetchone()[0])
+
+
+class CachedSearch(object):
+    # settings of "crosswordGenerator2.generateCrosswords" the search takes (passed on to the engines that take them)
+    searchParameters = ('searchMode', 'orderIndependent', 'workers')
+
+    def __init__(self, words, cache, searchMode='ALL', orderIndependent=True, workers=1, engine='dfs',
+                 **searchOptions):
+        '''
+        Search engine in front of the engines of "crosswordGenerator2.searchEngines": a request already in the cache
+        is answered from it without searching; otherwise the engine searches, and its result is stored if the search
+        finished. In 'ALL' mode every crossword is stored, in 'FAST' mode the one found, and in 'IDEAL' mode only the
+        last (smallest) one.
+        :param words: list - words to be inserted into the crossword, in any order and case
+        :param cache: ResultCache object - the cache
+        :param searchMode: str - 'ALL', 'FAST' or 'IDEAL'
+        :param orderIndependent: bool - passed on to the engine, if it takes it
+        :param workers: int - passed on to the engine, if it takes it
+        :param engine: str - name of the search engine in "crosswordGenerator2.searchEngines"
+        :param searchOptions: other settings, passed on to the engine (frame, budgets, cancellation token...)
+        '''
+        self.wordsList = sorted([word.upper() for word in words])
+        self.cache = cache
+        self.searchMode = searchMode
+        self.engine = engine
+        self.searchOptions = searchOptions
+        self.engineClass = crosswordGenerator2.searchEngines[engine]
+        settings = {'searchMode': searchMode, 'orderIndependent': orderIndependent, 'workers': workers}
+        for parameter in self.engineClass.searchParameters:
+            self.searchOptions[parameter] = settings[parameter]
+        self.key = cacheKey(self.wordsList, searchMode, engine, self.searchOptions)
+        # True once the request has been answered from the cache
+        self.cacheHit = False
+        # same meaning as in the engines; a result from the cache keeps the stop reason of the search that found it
+        self.stopReason = None
+        self.infeasibility = None
+        self.nodesExpanded = 0
+
+    def search(self):
+        '''
+        :return: generator of Crossword objects
+        '''
+        cachedResult = self.cache.lookup(self.key)
+        # if the request is in the cache
+        if cachedResult is not None:
+            self.cacheHit = True
+            self.stopReason, self.infeasibility, cachedCrosswords = cachedResult
+            for placements in cachedCrosswords:
+                yield crosswordGenerator2.crosswordFromPlacements(placements, self.searchOptions.get('maxHeight'),
+                                                                  self.searchOptions.get('maxWidth'))
+            return
+        engineSearch = self.engineClass(self.wordsList, **self.searchOptions)
+        foundCrosswords = []
+        try:
+            for crossword in engineSearch.search():
+                if self.searchMode == 'IDEAL':
+                    foundCrosswords = [crossword.getPlacedWords()]
+                else:
+                    foundCrosswords.append(crossword.getPlacedWords())
+                yield crossword
+        finally:
+            self.stopReason = engineSearch.stopReason
+            self.infeasibility = engineSearch.infeasibility
+            self.nodesExpanded = engineSearch.nodesExpanded
+        # if the search finished, its result is complete
+        if self.stopReason in cachedStopReasons:
+            self.cache.store(self.key, self.stopReason, self.infeasibility, foundCrosswords)
+
+    def bestCrosswords(self):
+        '''
+        Runs the search (or reads its result from the cache), keeping only the smallest crosswords found.
+        :return: list - the smallest crosswords found (empty if none was found)
+        '''
+        best = []
+        for crossword in self.search():
+            if not best or crossword.getSize() < best[0].getSize():
+                best = [crossword]
+            elif crossword.getSize() == best[0].getSize():
+                best.append(crossword)
+        return best
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reports on, or clears, a cache of crossword search results.')
+    parser.add_argument('--path', default='crosswordCache.sqlite', help='database file of the cache')
+    parser.add_argument('--clear', action='store_true', help='evict every result')
+    arguments = parser.parse_args()
+
+    resultCache = ResultCache(arguments.path)
+    if arguments.clear:
+        resultCache.clear()
+    print('Results:', resultCache.getEntryCount())
+    print('Size:', resultCache.getTotalBytes(), 'bytes')
@@ -2,50 +2,116 @@ def crossword(words, findAll):
     '''
     input:
         words (list) - a list of strings to be inserted into the crossword
+        findAll (string) - 'ALL', 'FAST' or 'IDEAL'
     output:
-        crosswords (list of tuples) - a list of valid crossword arrangements. each entry is a tuple containing:
+        crosswords (list of tuples) - a list of unique valid crossword arrangements. each entry is a tuple containing:
                                       (max dimension, min dimension, height, width, crossword grid)
     constraints:
         for a crossword arrangement to be valid, all adjacent characters must be part of a word in words
     '''
+    return list(generateCrosswords(words, findAll, showProgress=True))
 
-# helper functions
-    import copy
 
-    def DFS(allWords, orderedWords, grid, availableLetters):
+
+def generateCrosswords(words, findAll, showProgress=False, stats=None):
+    '''
+    Lazy version of crossword(): each unique arrangement is yielded as soon as it is found, and the search stops as
+    soon as the caller stops consuming the arrangements.
+    inputs:
+        words (list) - a list of strings to be inserted into the crossword; the list is not modified
+        findAll (string) - 'ALL', 'FAST' or 'IDEAL'. in IDEAL mode every arrangement yielded is smaller than the
+                           previous one; in FAST mode only one arrangement is yielded
+        showProgress (bool) - if True, the progress through the permutations of words is printed
+        stats (dict) - if given, the search counts where it spends its effort in it: 'nodesPerDepth' (dict of partial
+                       grids expanded per number of words placed), 'insertRejections' (insertions rejected by
+                       insertWord), 'boundPrunes' (insertions pruned by the IDEAL lower bound), 'leafRejections'
+                       (complete grids rejected by isValidGrid), 'duplicatesDropped' (arrangements already yielded)
+                       and 'phaseSeconds' (dict of seconds spent in 'search' and 'leafChecks')
+    output:
+        generator of tuples: (max dimension, min dimension, height, width, crossword grid)
+    '''
+
+# helper functions
+    def DFS(allWords, orderedWords, grid, availableLetters, extents):
         '''
-        recursive depth-first search function
+        recursive depth-first search generator
         inputs:
             allWords (list) - the list of all the words that will be added to the crossword
             orderedWords (list) - the list of words that still need to be added, in the order they will be added
-            grid (list of lists) - the crossword grid
+            grid (list of lists) - the crossword grid, shared by the whole search; it is restored before returning
             availableLetters (dict) - keys are the letters of the alphabet, values are coordinates (tuples) describing
                                       where the letter is available on the grid: (row index, column index, 'across'/'down')
+            extents (tuple) - bounding box of the letters on the grid: (min row, max row, min column, max column)
         output:
-            output (list of tuples) - a list of valid crossword arrangements. each entry is a tuple containing:
-                                      (max dimension, min dimension, height, width, crossword grid)
+            generator of valid crossword arrangements. each entry is a tuple containing:
+            (max dimension, min dimension, height, width, crossword grid)
         '''
-        output = []
+        nonlocal bestDimensions
+        if stats is not None:
+            depth = len(allWords) - len(orderedWords)
+            stats['nodesPerDepth'][depth] = stats['nodesPerDepth'].get(depth, 0) + 1
         # if all the words have been inserted
         if not orderedWords:
-            # if the grid is valid, trim it and return it up to the previous depth
-            if isValidGrid(allWords, grid):
-                return [trimGrid(grid)]
-            # if the grid is invalid, return nothing back up to the previous depth
+            if stats is not None:
+                checkStartTime = time.perf_counter()
+                validGrid = isValidGrid(allWords, grid)
+                stats['phaseSeconds']['leafChecks'] += time.perf_counter() - checkStartTime
+                if not validGrid:
+                    stats['leafRejections'] += 1
             else:
-                return []
+                validGrid = isValidGrid(allWords, grid)
+            # if the grid is valid, trim it and pass it up to the previous depth
+            if validGrid:
+                trimmedGrid = trimGrid(grid)
+                # if IDEAL option was selected, this is the smallest arrangement so far (larger ones are pruned)
+                if findAll == 'IDEAL' and (not bestDimensions or trimmedGrid[:2] < bestDimensions):
+                    bestDimensions = trimmedGrid[:2]
+                yield trimmedGrid
         # if there are more words to insert
         else:
             for index, char in enumerate(orderedWords[0]):
                 for dictIndex, position in enumerate(availableLetters[char]):
-                    newGrid, newAvailableLetters = insertWord(orderedWords[0], index, copy.deepcopy(grid), position, copy.deepcopy(availableLetters))
-                    if newGrid:
-                        newAvailableLetters[char].pop(dictIndex)
-                        output += DFS(allWords, orderedWords[1:], newGrid, newAvailableLetters)
-        return output
+                    # the word is inserted into the one shared grid, and taken out again before the next position
+                    insertedPositions = insertWord(orderedWords[0], index, grid, position, availableLetters, allWords)
+                    if insertedPositions is not None:
+                        # update the bounding box with the inserted word
+                        if position[2] == 'across':
+                            newExtents = (min(extents[0], position[0]), max(extents[1], position[0]),
+                                          min(extents[2], position[1] - index),
+                                          max(extents[3], position[1] - index + len(orderedWords[0]) - 1))
+                        else:
+                            newExtents = (min(extents[0], position[0] - index),
+                                          max(extents[1], position[0] - index + len(orderedWords[0]) - 1),
+                                          min(extents[2], position[1]), max(extents[3], position[1]))
+                        # if IDEAL option was selected, skip arrangements that cannot beat the smallest one so far
+                        if not (findAll == 'IDEAL' and bestDimensions
+                                and lowerBoundDimensions(newExtents, orderedWords[1:]) >= bestDimensions):
+                            availableLetters[char].pop(dictIndex)
+                            yield from DFS(allWords, orderedWords[1:], grid, availableLetters, newExtents)
+                            availableLetters[char].insert(dictIndex, position)
+                        elif stats is not None:
+                            stats['boundPrunes'] += 1
+                        removeLetters(insertedPositions, grid, availableLetters)
+                    elif stats is not None:
+                        stats['insertRejections'] += 1
 
 
-    def insertWord(word, crossLetterIndex, grid, position, availableLetters):
+    def lowerBoundDimensions(extents, remainingWords):
+        '''
+        inputs:
+            extents (tuple) - bounding box of the letters on the grid: (min row, max row, min column, max column)
+            remainingWords (list) - the words that still need to be added
+        output:
+            a tuple (max dimension, min dimension) that no completed arrangement of this grid can be smaller than;
+            the bounding box only grows, and every remaining word has to fit inside it
+        '''
+        height = extents[1] - extents[0] + 1
+        width = extents[3] - extents[2] + 1
+        longestWord = max([len(word) for word in remainingWords], default=0)
+        return (max(height, width, longestWord), min(height, width))
+
+
+    def insertWord(word, crossLetterIndex, grid, position, availableLetters, allWords):
         '''
         inputs:
             word (string) - the word to be inserted into the grid
@@ -54,63 +120,199 @@ def crossword(words, findAll):
             position (tuple) - coordinate where the inserted word will cross with an existing word (row index, column index, 'across'/'down')
             availableLetters (dict) - keys are the letters of the alphabet, values are coordinates (tuples) describing
                                       where the letter is available on the grid: (row index, column index, 'across'/'down')
+            allWords (list) - all the words of the crossword
         outputs:
-            returns the new crossword grid (if word is successfully inserted), returns [] otherwise
-            returns the new availableLetters dictionary
+            returns the list of blank positions (row index, column index) that were filled in, if word is successfully
+            inserted; grid and availableLetters are updated in place
+            returns None otherwise, leaving grid and availableLetters unchanged
         '''
+        insertedPositions = []
         # if inserting across
         if position[2] == 'across':
+            # if the word runs end-to-end into existing letters, the run they form must still be completable
+            if formsStrayRun(grid, position[0], position[1] - crossLetterIndex, word, 'across', allWords):
+                return None
             # insert the letters right of the crossLetter
             for lettersAfterCross in range(1, len(word) - crossLetterIndex):
                 # if the position is blank, insert letter
                 if grid[position[0]][position[1] + lettersAfterCross] == ' ':
+                    # if the letter touches a parallel neighbour, the column it forms must still be completable
+                    if formsStrayWord(grid, position[0], position[1] + lettersAfterCross,
+                                      word[crossLetterIndex + lettersAfterCross], 'down', allWords):
+                        removeLetters(insertedPositions, grid, availableLetters)
+                        return None
                     grid[position[0]][position[1] + lettersAfterCross] = word[crossLetterIndex + lettersAfterCross]
                     availableLetters[word[crossLetterIndex + lettersAfterCross]] += [(position[0], position[1] + lettersAfterCross, 'down')]
+                    insertedPositions.append((position[0], position[1] + lettersAfterCross))
                 # if the position already contains this letter, do nothing
                 elif grid[position[0]][position[1] + lettersAfterCross] == word[crossLetterIndex + lettersAfterCross]:
                     pass
                 # if the position already contains another letter, the word cannot be inserted
                 else:
-                    return [], availableLetters
+                    removeLetters(insertedPositions, grid, availableLetters)
+                    return None
             # insert the letters left of the crossLetter
             for indexLetterBefore in range(crossLetterIndex):
                 # if the position is blank, insert letter
                 if grid[position[0]][position[1] - crossLetterIndex + indexLetterBefore] == ' ':
+                    # if the letter touches a parallel neighbour, the column it forms must still be completable
+                    if formsStrayWord(grid, position[0], position[1] - crossLetterIndex + indexLetterBefore,
+                                      word[indexLetterBefore], 'down', allWords):
+                        removeLetters(insertedPositions, grid, availableLetters)
+                        return None
                     grid[position[0]][position[1] - crossLetterIndex + indexLetterBefore] = word[indexLetterBefore]
                     availableLetters[word[indexLetterBefore]] += [(position[0], position[1] - crossLetterIndex + indexLetterBefore, 'down')]
+                    insertedPositions.append((position[0], position[1] - crossLetterIndex + indexLetterBefore))
                 # if the position already contains this letter, do nothing
                 elif grid[position[0]][position[1] - crossLetterIndex + indexLetterBefore] == word[indexLetterBefore]:
                     pass
                 # if the position already contains another letter, the word cannot be inserted
                 else:
-                    return [], availableLetters
+                    removeLetters(insertedPositions, grid, availableLetters)
+                    return None
         # if inserting down
         else:
+            # if the word runs end-to-end into existing letters, the run they form must still be completable
+            if formsStrayRun(grid, position[0] - crossLetterIndex, position[1], word, 'down', allWords):
+                return None
             # insert the letters below the crossLetter
             for lettersBelowCross in range(1, len(word) - crossLetterIndex):
                 # if the position is blank, insert letter
                 if grid[position[0] + lettersBelowCross][position[1]] == ' ':
+                    # if the letter touches a parallel neighbour, the row it forms must still be completable
+                    if formsStrayWord(grid, position[0] + lettersBelowCross, position[1],
+                                      word[crossLetterIndex + lettersBelowCross], 'across', allWords):
+                        removeLetters(insertedPositions, grid, availableLetters)
+                        return None
                     grid[position[0] + lettersBelowCross][position[1]] = word[crossLetterIndex + lettersBelowCross]
                     availableLetters[word[crossLetterIndex + lettersBelowCross]] += [(position[0] + lettersBelowCross, position[1], 'across')]
+                    insertedPositions.append((position[0] + lettersBelowCross, position[1]))
                 # if the position already contains this letter, do nothing
                 elif grid[position[0] + lettersBelowCross][position[1]] == word[crossLetterIndex + lettersBelowCross]:
                     pass
                 # if the position already contains another letter, the word cannot be inserted
                 else:
-                    return [], availableLetters
+                    removeLetters(insertedPositions, grid, availableLetters)
+                    return None
             # insert the letters above the crossLetter
             for indexLetterAbove in range(crossLetterIndex):
                 # if the position is blank, insert letter
                 if grid[position[0] - crossLetterIndex + indexLetterAbove][position[1]] == ' ':
+                    # if the letter touches a parallel neighbour, the row it forms must still be completable
+                    if formsStrayWord(grid, position[0] - crossLetterIndex + indexLetterAbove, position[1],
+                                      word[indexLetterAbove], 'across', allWords):
+                        removeLetters(insertedPositions, grid, availableLetters)
+                        return None
                     grid[position[0] - crossLetterIndex + indexLetterAbove][position[1]] = word[indexLetterAbove]
                     availableLetters[word[indexLetterAbove]] += [(position[0] - crossLetterIndex + indexLetterAbove, position[1], 'across')]
+                    insertedPositions.append((position[0] - crossLetterIndex + indexLetterAbove, position[1]))
                 # if the position already contains this letter, do nothing
                 elif grid[position[0] - crossLetterIndex + indexLetterAbove][position[1]] == word[indexLetterAbove]:
                     pass
                 # if the position already contains another letter, the word cannot be inserted
                 else:
-                    return [], availableLetters
-        return grid, availableLetters
+                    removeLetters(insertedPositions, grid, availableLetters)
+                    return None
+        return insertedPositions
+
+
+    def removeLetters(insertedPositions, grid, availableLetters):
+        '''
+        Takes letters written by insertWord out of the grid again, most recent first, so each position is also the
+        last one recorded for its letter in availableLetters.
+        inputs:
+            insertedPositions (list) - the positions (row index, column index) that were filled in, in order
+            grid (list of lists) - the crossword grid
+            availableLetters (dict) - keys are the letters of the alphabet, values are coordinates (tuples) describing
+                                      where the letter is available on the grid: (row index, column index, 'across'/'down')
+        '''
+        for row, col in reversed(insertedPositions):
+            availableLetters[grid[row][col]].pop()
+            grid[row][col] = ' '
+
+
+    def formsStrayWord(grid, row, col, char, direction, allWords):
+        '''
+        Checks the run of letters that char would form with its neighbours in the given direction, if it were
+        written at (row, col). Since letters are never removed, that run can only grow, and isValidGrid accepts a
+        grid whose runs are all words of the crossword, so the run must appear inside one of allWords.
+        inputs:
+            grid (list of lists) - the crossword grid
+            row (int) - row index of the blank position where char would be written
+            col (int) - column index of the blank position where char would be written
+            char (string) - the letter that would be written
+            direction (string) - 'across' to read the run along the row, 'down' to read it along the column
+            allWords (list) - all the words of the crossword
+        output:
+            returns True, if char would touch a neighbour and form a run that no word can complete
+            returns False, otherwise
+        '''
+        if direction == 'across':
+            before = ''
+            colIndex = col - 1
+            while grid[row][colIndex] != ' ':
+                before = grid[row][colIndex] + before
+                colIndex -= 1
+            after = ''
+            colIndex = col + 1
+            while grid[row][colIndex] != ' ':
+                after += grid[row][colIndex]
+                colIndex += 1
+        else:
+            before = ''
+            rowIndex = row - 1
+            while grid[rowIndex][col] != ' ':
+                before = grid[rowIndex][col] + before
+                rowIndex -= 1
+            after = ''
+            rowIndex = row + 1
+            while grid[rowIndex][col] != ' ':
+                after += grid[rowIndex][col]
+                rowIndex += 1
+        # a lone letter does not form a word
+        if not before and not after:
+            return False
+        run = before + char + after
+        for word in allWords:
+            if run in word:
+                return False
+        return True
+
+
+    def formsStrayRun(grid, row, col, word, direction, allWords):
+        '''
+        Checks the run of letters that word would form with the letters just before and just after it, if it were
+        written from (row, col). As in formsStrayWord, that run must appear inside one of allWords.
+        inputs:
+            grid (list of lists) - the crossword grid
+            row (int) - row index of the first letter of word
+            col (int) - column index of the first letter of word
+            word (string) - the word that would be written
+            direction (string) - 'across' or 'down'
+            allWords (list) - all the words of the crossword
+        output:
+            returns True, if word would run into existing letters and form a run that no word can complete
+            returns False, otherwise
+        '''
+        rowStep, colStep = (0, 1) if direction == 'across' else (1, 0)
+        before = ''
+        rowIndex, colIndex = row - rowStep, col - colStep
+        while grid[rowIndex][colIndex] != ' ':
+            before = grid[rowIndex][colIndex] + before
+            rowIndex, colIndex = rowIndex - rowStep, colIndex - colStep
+        after = ''
+        rowIndex, colIndex = row + rowStep * len(word), col + colStep * len(word)
+        while grid[rowIndex][colIndex] != ' ':
+            after += grid[rowIndex][colIndex]
+            rowIndex, colIndex = rowIndex + rowStep, colIndex + colStep
+        # a word with blank positions at both ends forms no longer run
+        if not before and not after:
+            return False
+        run = before + word + after
+        for otherWord in allWords:
+            if run in otherWord:
+                return False
+        return True
 
 
     def isValidGrid(words, grid):
@@ -195,6 +397,24 @@ def crossword(words, findAll):
         #return (max(width, height), min(width, height), grid)
         return (max(width, height), min(width, height), height, width, grid)
 
+    def uniquePermutations(words):
+        '''
+        input:
+            words (list) - words to order
+        output:
+            generator of every distinct order (tuple) of words; unlike itertools.permutations, orders that only swap
+            two copies of the same word are not repeated
+        '''
+        if not words:
+            yield ()
+            return
+        for index, word in enumerate(words):
+            if word in words[:index]:
+                continue
+            for order in uniquePermutations(words[:index] + words[index + 1:]):
+                yield (word,) + order
+
+
     def initializeGrid(orderedWords, maxSize):
         '''
         inputs:
@@ -225,69 +445,163 @@ def crossword(words, findAll):
 
 #execute function
 
-    # determine grid size and capitalize the words
-    maxSize = 2
-    for index, word in enumerate(words):
-        maxSize += len(word)
-        words[index] = word.upper()
+    # capitalize the words (into a new list, the caller's list is left as it is) and determine grid size
+    words = [word.upper() for word in words]
+    # the counters are set up even if nothing is searched
+    import time
+    if stats is not None:
+        for counter in ('insertRejections', 'boundPrunes', 'leafRejections', 'duplicatesDropped'):
+            stats.setdefault(counter, 0)
+        stats.setdefault('nodesPerDepth', {})
+        stats.setdefault('phaseSeconds', {}).setdefault('search', 0.0)
+        stats['phaseSeconds'].setdefault('leafChecks', 0.0)
+        searchStartTime = time.perf_counter()
+    # if the words can never form a crossword, there is nothing to search
+    if infeasibilityReason(words) is not None:
+        return
+    maxSize = 2 + sum([len(word) for word in words])
 
-    # initialize output list of valid crossword arrangements
-    crosswords = []
+    # fingerprints of the arrangements yielded so far (a reflected arrangement counts as the same arrangement)
+    discoveredFingerprints = set()
+    # (max dimension, min dimension) of the smallest arrangement found so far, used to prune the IDEAL search
+    bestDimensions = ()
 
-    # execute a DFS for every permutation of words, append all valid arrangements to crosswords list
-    import itertools
-    permutations = list(itertools.permutations(words))
-    for index, orderedWords in enumerate(permutations):
-        print('Progress: ', round(index / len(permutations) * 100, 3), '%')
+    # every arrangement contains every word, and can be built up from any one of them, so the first word always
+    # starts the DFS (placed across): an arrangement is then found once, instead of once from each of its words
+    firstWord = words[0]
+    otherWords = words[1:]
+    # execute a DFS for every distinct order of the other words, yield every new valid arrangement
+    # (orders are generated lazily, only their count is needed up front for the progress report)
+    import math
+    ordersCount = math.factorial(len(otherWords))
+    for word in set(otherWords):
+        ordersCount //= math.factorial(otherWords.count(word))
+    for index, otherWordsOrder in enumerate(uniquePermutations(otherWords)):
+        orderedWords = (firstWord,) + otherWordsOrder
+        if showProgress:
+            print('Progress: ', round(index / ordersCount * 100, 3), '%')
         grid, availableLetters = initializeGrid(orderedWords, maxSize)
-        crosswords += DFS(words, orderedWords[1:], grid, availableLetters)
-        # if FAST option was selected, stop iterating
-        if findAll == 'FAST' and crosswords:
-            break
-    print('Progress: 100 %\n')
+        extents = ((maxSize - 1) // 2, (maxSize - 1) // 2,
+                   (maxSize - len(orderedWords[0])) // 2, (maxSize - len(orderedWords[0])) // 2 + len(orderedWords[0]) - 1)
+        for trimmedGrid in DFS(words, orderedWords[1:], grid, availableLetters, extents):
+            fingerprint = gridFingerprint(trimmedGrid[4])
+            if fingerprint not in discoveredFingerprints:
+                discoveredFingerprints.add(fingerprint)
+                if stats is not None:
+                    stats['phaseSeconds']['search'] += time.perf_counter() - searchStartTime
+                yield trimmedGrid
+                if stats is not None:
+                    searchStartTime = time.perf_counter()
+                # if FAST option was selected, stop iterating
+                if findAll == 'FAST':
+                    return
+            elif stats is not None:
+                stats['duplicatesDropped'] += 1
+    if stats is not None:
+        stats['phaseSeconds']['search'] += time.perf_counter() - searchStartTime
+    if showProgress:
+        print('Progress: 100 %\n')
 
-    # return all solutions
-    return crosswords
 
 
+def infeasibilityReason(words):
+    '''
+    Quick check, run before the search starts, for lists of words that can never form a crossword. Every check is a
+    necessary condition for a crossword, so a list that can be arranged is never rejected.
+    input:
+        words (list) - upper-case words to be inserted into the crossword
+    output:
+        None if no reason was found, otherwise one of the following reason codes (string):
+            'noWords' - the list is empty
+            'invalidCharacters' - a word contains a character other than the letters A-Z
+            'disconnected' - the words cannot all be connected, as some words share no letter with the others
+            'tooFewCrossings' - every word after the first is inserted across a letter of another word, so n words
+                                take at least n - 1 crossings, and the words do not have enough pairs of equal letters
+    '''
+    if not words:
+        return 'noWords'
+    for word in words:
+        if not word or not set(word) <= set('ABCDEFGHIJKLMNOPQRSTUVWXYZ'):
+            return 'invalidCharacters'
 
-# obtain user inputs
-while True:
-    findAll = str(input('To find all arrangements, enter ALL.\nTo find the ideal arrangement, enter IDEAL.\nTo find the fastest arrangement, enter FAST.\n\n'))
-    if findAll.upper() == 'ALL':
-        findAll = 'ALL'
-        break
-    elif findAll.upper() == 'FAST':
-        findAll = 'FAST'
-        break
-    elif findAll.upper() == 'IDEAL':
-        findAll = 'IDEAL'
-        break
-    else:
-        print('Invalid input.\n')
-print('\n')
-validCrosswords = crossword(str(input('Enter list of words: ')).replace(',',' ').split(), findAll)
-
-# assemble list of unique valid crossword arrangements
-uniqueCrosswords = []
-for crossword in validCrosswords:
-    if crossword not in uniqueCrosswords:
-        uniqueCrosswords.append(crossword)
-uniqueCrosswords.sort()
-
-# print the crossword(s)
-if uniqueCrosswords:
-    if findAll == 'ALL':
-        for crossword in uniqueCrosswords[::-1]:
-            # print dimensions of crossword
-            print('\nSize:', crossword[2], 'x', crossword[3])
-            # print each row of the crossword
-            for row in crossword[4]:
+    # walk the graph linking the words that share a letter, starting from the first word
+    connectedWords = {0}
+    wordsToVisit = [0]
+    while wordsToVisit:
+        wordIndex = wordsToVisit.pop()
+        for otherIndex, otherWord in enumerate(words):
+            if otherIndex not in connectedWords and set(words[wordIndex]) & set(otherWord):
+                connectedWords.add(otherIndex)
+                wordsToVisit.append(otherIndex)
+    if len(connectedWords) < len(words):
+        return 'disconnected'
+
+    # a letter that appears "total" times over all the words, at most "most" times in one word, can be used by at most
+    # min(total // 2, total - most) crossings: every crossing takes one of its occurrences from each of two words
+    totalCounts = {}
+    mostCounts = {}
+    for word in words:
+        for char in set(word):
+            totalCounts[char] = totalCounts.get(char, 0) + word.count(char)
+            mostCounts[char] = max(mostCounts.get(char, 0), word.count(char))
+    maxCrossings = sum([min(total // 2, total - mostCounts[char]) for char, total in totalCounts.items()])
+    if maxCrossings < len(words) - 1:
+        return 'tooFewCrossings'
+    return None
+
+
+
+def gridFingerprint(grid):
+    '''
+    input:
+        grid (list of lists) - a trimmed crossword grid
+    output:
+        a hashable fingerprint of the grid that is the same for the grid and its reflection across the diagonal
+    '''
+    rows = tuple(''.join(row) for row in grid)
+    cols = tuple(''.join(col) for col in zip(*grid))
+    return min(rows, cols)
+
+
+
+if __name__ == '__main__':
+    # obtain user inputs
+    while True:
+        findAll = str(input('To find all arrangements, enter ALL.\nTo find the ideal arrangement, enter IDEAL.\nTo find the fastest arrangement, enter FAST.\n\n'))
+        if findAll.upper() == 'ALL':
+            findAll = 'ALL'
+            break
+        elif findAll.upper() == 'FAST':
+            findAll = 'FAST'
+            break
+        elif findAll.upper() == 'IDEAL':
+            findAll = 'IDEAL'
+            break
+        else:
+            print('Invalid input.\n')
+    print('\n')
+    words = str(input('Enter list of words: ')).replace(',',' ').split()
+    # find the unique valid crossword arrangements (a reflected arrangement counts as the same arrangement)
+    uniqueCrosswords = sorted(crossword(words, findAll))
+
+    # print the crossword(s)
+    if uniqueCrosswords:
+        if findAll == 'ALL':
+            for crossword in uniqueCrosswords[::-1]:
+                # print dimensions of crossword
+                print('\nSize:', crossword[2], 'x', crossword[3])
+                # print each row of the crossword
+                for row in crossword[4]:
+                    print(row)
+            print('\n' + str(len(uniqueCrosswords)) + ' unique crossword arrangements.')
+        else:
+            # print each row of the first/only crossword
+            for row in uniqueCrosswords[0][4]:
                 print(row)
-        print('\n' + str(len(uniqueCrosswords)) + ' unique crossword arrangements.')
     else:
-        # print each row of the first/only crossword
-        for row in uniqueCrosswords[0][4]:
-            print(row)
-else:
-    print('No possible crossword arrangements.')
\ No newline at end of file
+        # say why, if the words were rejected before the search
+        reason = infeasibilityReason([word.upper() for word in words])
+        if reason is not None:
+            print('No possible crossword arrangements (' + reason + ').')
+        else:
+            print('No possible crossword arrangements.')
\ No newline at end of file
@@ -1,100 +1,235 @@
-import copy
-import itertools
+import collections
+import multiprocessing
+import random
+import string
 import time
-import numpy as np
-import pandas as pd
+import crosswordRender
 
 
-wordsList = ['david', 'selma', 'alex', 'quique', 'mamita']
-
 class Crossword(object):
-    def __init__(self, parentCrossword=None, insertPosition=None, insertOrientation=None, wordsList=None):
+    # letters live in a flat bytearray ("board"): (row, col) is stored at index
+    # (row + rowOffset) * boardWidth + col + colOffset, so every neighbour is one index (across) or one board width
+    # (down) away; blank positions hold b' '.
+    # "placedWords" holds (word, position, orientation) for every word on the board, in the order they were inserted,
+    # and "crossingCount" the number of letters of placed words written over a letter that was already on the board.
+    __slots__ = ('validInitialization', 'undoLog', 'allWords', 'wordsToInsert', 'placedWords', 'crossingCount',
+                 'strictAdjacency', 'frame', 'board', 'boardWidth', 'rowOffset', 'colOffset', 'minRow', 'maxRow',
+                 'minCol', 'maxCol')
+
+    def __init__(self, parentCrossword=None, insertPosition=None, insertOrientation=None, wordsList=None,
+                 insertIndex=0, boardMargin=None, strictAdjacency=False, maxHeight=None, maxWidth=None,
+                 transpose=False):
         '''
         # If self is an updated version of a previous Crossword object, input the following 3 parameters:
             :param parentCrossword: Crossword object - the previous iteration of which self is an updated version
             :param insertPosition: tuple (row, col) - position where first letter of next word will be inserted
             :param insertOrientation: int - 0 for 'across', 1 for 'down'
+          and optionally:
+            :param insertIndex: int - index in the parent's words to insert of the word to insert next (default 0)
+          (with only parentCrossword, self is a copy of the parent crossword, or with transpose=True, of its transpose)
 
         # if self is a seed crossword (i.e. starting from a blank crossword), input only the following parameter:
             :param wordsList: list - ordered list of words to be inserted into the crossword
+
+        # in both cases, optionally:
+            :param boardMargin: int - blank positions to allocate around the bounding box (see "allocateBoard")
+          and for a seed crossword (copies keep the settings of their parent):
+            :param strictAdjacency: bool - if True, a letter may only touch the letters of its own word and of the
+                                           words it crosses (see "formsStrayWord")
+            :param maxHeight: int - maximum number of rows of the crossword (None for no limit)
+            :param maxWidth: int - maximum number of columns of the crossword (None for no limit); a word is not
+                                   inserted if the crossword would then fit the frame neither as it is nor
+                                   transposed (see "fitsFrame")
+
+        The search does not create a Crossword for every update; it inserts words in place with "insertWord" and
+        takes them out again with "removeLastWord". Each insertion records what it changed in "self.undoLog".
         '''
 
         # flag defaults to True; if the next word could not be inserted into parent crossword because
         # it was blocked by an existing word, flag will become False
         self.validInitialization = True
+        self.undoLog = []
 
-        # if this crossword is an updated version of another crossword
+        # if this crossword is a copy or an updated version of another crossword
         if parentCrossword:
-            self.wordsToInsert = parentCrossword.getWordsToInsert()[1:]
-            self.lettersDict = parentCrossword.getLettersDict()
-            self.positionsDict = parentCrossword.getPositionsDict()
+            self.allWords = parentCrossword.getAllWords()
+            self.wordsToInsert = parentCrossword.getWordsToInsert()
+            self.placedWords = parentCrossword.getPlacedWords()
+            self.crossingCount = parentCrossword.getCrossingCount()
+            self.strictAdjacency = parentCrossword.getStrictAdjacency()
+            self.frame = parentCrossword.getFrame()
             self.minRow = parentCrossword.getMinRow()
             self.maxRow = parentCrossword.getMaxRow()
             self.minCol = parentCrossword.getMinCol()
             self.maxCol = parentCrossword.getMaxCol()
-            # insert next word 'across'
-            if insertOrientation == 0:
-                for index, char in enumerate(parentCrossword.getWordsToInsert()[0]):
-                    # if position is blank
-                    if (insertPosition[0], insertPosition[1] + index) not in self.positionsDict:
-                        # add letter in that position
-                        self.positionsDict[(insertPosition[0], insertPosition[1] + index)] = char
-                        self.lettersDict[char].append((insertPosition[0], insertPosition[1] + index))
-                        # update minCol
-                        if index == 0:
-                            self.minCol = min(self.minCol, insertPosition[1])
-                    # if position is already taken by another letter
-                    elif self.positionsDict[(insertPosition[0], insertPosition[1] + index)] != char:
-                        # self is an invalid crossword; flip flag to False
-                        self.validInitialization = False
-                        break
-                # if word inserted successfully, update maxCol
-                else:
-                    self.maxCol = max(self.maxCol, insertPosition[1] + len(parentCrossword.getWordsToInsert()[0]) - 1)
-            # insert next word 'down'
-            elif insertOrientation == 1:
-                for index, char in enumerate(parentCrossword.getWordsToInsert()[0]):
-                    # if position is blank
-                    if (insertPosition[0] + index, insertPosition[1]) not in self.positionsDict:
-                        # add letter in that position
-                        self.positionsDict[(insertPosition[0] + index, insertPosition[1])] = char
-                        self.lettersDict[char].append((insertPosition[0] + index, insertPosition[1]))
-                        # update minRow
-                        if index == 0:
-                            self.minRow = min(self.minRow, insertPosition[0])
-                    # if position is already taken by another letter
-                    elif self.positionsDict[(insertPosition[0] + index, insertPosition[1])] != char:
-                        # self is an invalid crossword; flip flag to False
-                        self.validInitialization = False
-                        break
-                # if word inserted successfully, update maxRow
-                else:
-                    self.maxRow = max(self.maxRow, insertPosition[0] + len(parentCrossword.getWordsToInsert()[0]) - 1)
+            # if this crossword is the transpose of the other crossword, its rows are the other crossword's columns
+            if transpose:
+                self.placedWords = [(word, (col, row), 1 - orientation)
+                                    for word, (row, col), orientation in self.placedWords]
+                self.minRow, self.maxRow, self.minCol, self.maxCol = self.minCol, self.maxCol, self.minRow, self.maxRow
+                self.allocateBoard(boardMargin)
+                for row, rowChars in enumerate(parentCrossword.getColumns(), self.minRow):
+                    for col, char in enumerate(rowChars.encode(), self.minCol):
+                        if char != 32:
+                            self.board[self.getIndex((row, col))] = char
+            # otherwise the rows are copied over whole
+            else:
+                self.allocateBoard(boardMargin)
+                for row, rowBytes in enumerate(parentCrossword.getRowBytes(), self.minRow):
+                    firstIndex = self.getIndex((row, self.minCol))
+                    self.board[firstIndex:firstIndex + len(rowBytes)] = rowBytes
+            if insertPosition is not None:
+                self.validInitialization = self.insertWord(insertIndex, insertPosition, insertOrientation)
 
         # if this is a seed crossword (i.e. starting from a blank crossword)
         else:
+            self.allWords = tuple(sorted(wordsList))
             self.wordsToInsert = wordsList[1:]
-            self.lettersDict = {'A':[], 'B':[], 'C':[], 'D':[], 'E':[], 'F':[], 'G':[], 'H':[], 'I':[], 'J':[], 'K':[],
-                            'L':[], 'M':[], 'N':[], 'O':[], 'P':[], 'Q':[], 'R':[], 'S':[], 'T':[], 'U':[], 'V':[],
-                            'W':[], 'X':[], 'Y':[], 'Z':[]}
-            self.positionsDict = {}
-            # insert initial word 'across' starting from (0, 0)
-            for index, char in enumerate(wordsList[0]):
-                self.lettersDict[char].append((0, index))
-                self.positionsDict[(0, index)] = char
+            self.placedWords = [(wordsList[0], (0, 0), 0)]
+            self.crossingCount = 0
+            self.strictAdjacency = strictAdjacency
+            # frame as (maximum rows, maximum columns), None if there is no frame
+            self.frame = None
+            if maxHeight is not None or maxWidth is not None:
+                self.frame = (maxHeight or float('inf'), maxWidth or float('inf'))
             self.minRow = 0
             self.maxRow = 0
             self.minCol = 0
             self.maxCol = len(wordsList[0]) - 1
+            self.allocateBoard(boardMargin)
+            # insert initial word 'across' starting from (0, 0)
+            for index, char in enumerate(wordsList[0]):
+                self.board[self.getIndex((0, index))] = ord(char)
+
+    def allocateBoard(self, margin=None):
+        '''
+        Creates a blank board around the bounding box. No letter can end up further from the bounding box than the
+        total length of the words to insert, nor outside the frame, and one more blank position on every side lets
+        neighbours be read without bounds checks.
+        :param margin: int - blank positions on every side of the bounding box; by default, enough for every word to
+                             insert to be inserted in place. A smaller margin is only safe for as many insertions as
+                             it leaves room for (the longest word to insert + 2 for one insertion).
+        :return: None
+        '''
+        if margin is None:
+            margin = sum([len(word) for word in self.wordsToInsert]) + 1
+            # with a frame, the bounding box can only grow until its shorter side is as long as the frame's longer one
+            if self.frame is not None and max(self.frame) < margin:
+                margin = min(margin, max(self.frame) - min(self.maxRow - self.minRow, self.maxCol - self.minCol))
+        self.boardWidth = self.maxCol - self.minCol + 1 + 2 * margin
+        self.rowOffset = margin - self.minRow
+        self.colOffset = margin - self.minCol
+        self.board = bytearray(b' ') * (self.boardWidth * (self.maxRow - self.minRow + 1 + 2 * margin))
+
+    def insertWord(self, insertIndex, insertPosition, insertOrientation):
+        '''
+        Inserts one of the words to insert in place. If the word is blocked by an existing word, or would form letters
+        that no remaining word can complete, the crossword is left unchanged.
+        :param insertIndex: int - index in "self.wordsToInsert" of the word to insert
+        :param insertPosition: tuple (row, col) - position where first letter of the word will be inserted
+        :param insertOrientation: int - 0 for 'across', 1 for 'down'
+        :return: bool - True if the word was inserted
+        '''
+        word = self.wordsToInsert.pop(insertIndex)
+        # the word cannot take the crossword out of its frame (checked before the board is read: the board only
+        # holds the frame)
+        if self.frame is not None:
+            height = max(self.maxRow, insertPosition[0] + insertOrientation * (len(word) - 1)) - \
+                     min(self.minRow, insertPosition[0]) + 1
+            width = max(self.maxCol, insertPosition[1] + (1 - insertOrientation) * (len(word) - 1)) - \
+                    min(self.minCol, insertPosition[1]) + 1
+            if not self.fitsFrame(height, width):
+                self.wordsToInsert.insert(insertIndex, word)
+                return False
+        board = self.board
+        step = 1 if insertOrientation == 0 else self.boardWidth
+        firstIndex = self.getIndex(insertPosition)
+        # the word cannot run end-to-end into an existing word
+        if board[firstIndex - step] != 32 or board[firstIndex + step * len(word)] != 32:
+            self.wordsToInsert.insert(insertIndex, word)
+            return False
+        insertedIndices = []
+        index = firstIndex
+        previousTaken = False
+        for char in word.encode():
+            # if position is blank
+            if board[index] == 32:
+                # if the letter touches a parallel neighbour, the run it forms must still be completable
+                if self.formsStrayWord(index, char, 1 - insertOrientation):
+                    break
+                # add letter in that position
+                board[index] = char
+                insertedIndices.append(index)
+                previousTaken = False
+            # if position is already taken by another letter
+            elif board[index] != char:
+                break
+            # with strict adjacency, two taken positions in a row belong to a word in the same direction, which the
+            # word would hide
+            elif previousTaken and self.strictAdjacency:
+                break
+            else:
+                previousTaken = True
+            index += step
+        # if word inserted successfully, record the change and update the bounding box
+        else:
+            self.undoLog.append((insertIndex, word, insertedIndices, self.minRow, self.maxRow, self.minCol,
+                                 self.maxCol))
+            self.placedWords.append((word, insertPosition, insertOrientation))
+            self.crossingCount += len(word) - len(insertedIndices)
+            self.minRow = min(self.minRow, insertPosition[0])
+            self.maxRow = max(self.maxRow, insertPosition[0] + insertOrientation * (len(word) - 1))
+            self.minCol = min(self.minCol, insertPosition[1])
+            self.maxCol = max(self.maxCol, insertPosition[1] + (1 - insertOrientation) * (len(word) - 1))
+            return True
+        # if the word could not be inserted, take out the letters written so far
+        self.removeLetters(insertedIndices)
+        self.wordsToInsert.insert(insertIndex, word)
+        return False
+
+    def removeLastWord(self):
+        '''
+        Undoes the last successful "insertWord".
+        :return: None
+        '''
+        insertIndex, word, insertedIndices, self.minRow, self.maxRow, self.minCol, self.maxCol = self.undoLog.pop()
+        self.placedWords.pop()
+        self.crossingCount -= len(word) - len(insertedIndices)
+        self.removeLetters(insertedIndices)
+        self.wordsToInsert.insert(insertIndex, word)
+
+    def removeLetters(self, indices):
+        '''
+        Blanks the given board indices.
+        :param indices: list - board indices of letters written by "insertWord"
+        :return: None
+        '''
+        for index in indices:
+            self.board[index] = 32
 
+    def getIndex(self, position):
+        return (position[0] + self.rowOffset) * self.boardWidth + position[1] + self.colOffset
+    def getPosition(self, index):
+        row, col = divmod(index, self.boardWidth)
+        return row - self.rowOffset, col - self.colOffset
+    def getLetter(self, position):
+        return chr(self.board[self.getIndex(position)])
     def getValidInitialization(self):
         return self.validInitialization
+    def getAllWords(self):
+        return self.allWords
     def getWordsToInsert(self):
         return self.wordsToInsert.copy()
-    def getLettersDict(self):
-        return copy.deepcopy(self.lettersDict)
-    def getPositionsDict(self):
-        return self.positionsDict.copy()
+    def getPlacedWords(self):
+        return self.placedWords.copy()
+    def getPlacedCount(self):
+        return len(self.placedWords)
+    def getCrossingCount(self):
+        return self.crossingCount
+    def getStrictAdjacency(self):
+        return self.strictAdjacency
+    def getFrame(self):
+        return self.frame
     def getMinRow(self):
         return self.minRow
     def getMaxRow(self):
@@ -105,56 +240,129 @@ class Crossword(object):
         return self.maxCol
     def getSize(self):
         return max(self.maxRow - self.minRow + 1, self.maxCol - self.minCol + 1)
-    def setReIndexedPositionsDict(self):
-        '''
-        Re-indexes "self.positionsDict" so that the minimum row and column values are 0. Stores re-indexed
-        arrangement to a variable called "self.reIndexedPositionsDict"
-        '''
-        self.reIndexedPositionsDict = {}
-        for row, col in self.positionsDict:
-            self.reIndexedPositionsDict[(row - self.minRow, col - self.minCol)] = self.positionsDict[(row, col)]
-    def getReIndexedPositionsDict(self):
-        return self.reIndexedPositionsDict.copy()
-    def getReflectedPositionsDict(self):
-        reflectedPositionsDict = {}
-        for row, col in self.reIndexedPositionsDict:
-            reflectedPositionsDict[(col, row)] = self.reIndexedPositionsDict[(row, col)]
-        return reflectedPositionsDict.copy()
+    def getArea(self):
+        return (self.maxRow - self.minRow + 1) * (self.maxCol - self.minCol + 1)
+    def fitsFrame(self, height, width):
+        '''
+        A crossword and its transpose are the same arrangement, so a bounding box fits the frame if it fits as it is
+        or transposed.
+        :param height: int - number of rows of the bounding box
+        :param width: int - number of columns of the bounding box
+        :return: bool - True if there is no frame, or the bounding box fits it
+        '''
+        if self.frame is None:
+            return True
+        maxHeight, maxWidth = self.frame
+        return (height <= maxHeight and width <= maxWidth) or (width <= maxHeight and height <= maxWidth)
+    def getFramedCopy(self):
+        '''
+        :return: Crossword object - a copy of this crossword, transposed if only its transpose fits the frame
+        '''
+        if self.frame is not None and (self.maxRow - self.minRow >= self.frame[0] or
+                                       self.maxCol - self.minCol >= self.frame[1]):
+            return Crossword(parentCrossword=self, transpose=True)
+        return Crossword(parentCrossword=self)
+    def getLowerBound(self):
+        '''
+        Size that no completion of this crossword can be smaller than: the bounding box only grows, and every word
+        that still has to be inserted must fit inside it.
+        :return: int - lower bound on the size of any completed crossword
+        '''
+        return max([self.getSize()] + [len(word) for word in self.wordsToInsert])
+    def isCrossable(self, position, orientation):
+        '''
+        :param position: tuple (row, col) - position of a letter of a placed word
+        :param orientation: int - orientation of the placed word
+        :return: bool - False if a neighbour of the position in the other direction holds a letter; with strict
+                        adjacency, no word can then cross the placed word there, however the crossword grows
+        '''
+        index = self.getIndex(position)
+        step = self.boardWidth if orientation == 0 else 1
+        return self.board[index - step] == 32 and self.board[index + step] == 32
+    def formsStrayWord(self, index, char, orientation):
+        '''
+        Checks the run of letters that char would form with its neighbours if it were written at a blank position.
+        Letters are never removed as the search goes deeper, so that run can only end up as a valid word if a word
+        that is still to be inserted will be laid over it, i.e. the run must appear inside one of "self.wordsToInsert".
+        With "strictAdjacency", no such run is allowed at all: searches that never backtrack cannot count on a later
+        word to complete it.
+        :param index: int - board index of the blank position where char would be written
+        :param char: int - character code of the letter that would be written
+        :param orientation: int - direction in which to read the run; 0 for 'across', 1 for 'down'
+        :return: bool - True if char touches a neighbour and forms a run that no remaining word can complete
+        '''
+        board = self.board
+        step = 1 if orientation == 0 else self.boardWidth
+        # a lone letter does not form a word
+        if board[index - step] == 32 and board[index + step] == 32:
+            return False
+        if self.strictAdjacency:
+            return True
+        firstIndex = index
+        while board[firstIndex - step] != 32:
+            firstIndex -= step
+        lastIndex = index
+        while board[lastIndex + step] != 32:
+            lastIndex += step
+        run = (board[firstIndex:index:step] + bytes((char,)) + board[index + step:lastIndex + 1:step]).decode()
+        for word in self.wordsToInsert:
+            if run in word:
+                return False
+        return True
+
+    def getRows(self):
+        '''
+        :return: tuple - rows of the arrangement as strings, from the minimum to the maximum row and column, with
+                         blank positions as ' '
+        '''
+        firstIndex = self.getIndex((self.minRow, self.minCol))
+        width = self.maxCol - self.minCol + 1
+        return tuple(self.board[index:index + width].decode()
+                     for index in range(firstIndex, firstIndex + (self.maxRow - self.minRow + 1) * self.boardWidth,
+                                        self.boardWidth))
+    def getRowBytes(self):
+        '''
+        :return: tuple - rows of the arrangement as slices of the board (bytearrays), with blank positions as b' '
+        '''
+        firstIndex = self.getIndex((self.minRow, self.minCol))
+        width = self.maxCol - self.minCol + 1
+        return tuple(self.board[index:index + width]
+                     for index in range(firstIndex, firstIndex + (self.maxRow - self.minRow + 1) * self.boardWidth,
+                                        self.boardWidth))
+    def getColumns(self):
+        '''
+        :return: tuple - columns of the arrangement as strings, i.e. the rows of its reflection
+        '''
+        firstIndex = self.getIndex((self.minRow, self.minCol))
+        length = (self.maxRow - self.minRow) * self.boardWidth + 1
+        return tuple(self.board[index:index + length:self.boardWidth].decode()
+                     for index in range(firstIndex, firstIndex + self.maxCol - self.minCol + 1))
+    def getFingerprint(self):
+        '''
+        Canonical, hashable fingerprint of the arrangement. The letters are re-indexed so that the minimum row and
+        column values are 0, and the arrangement is compared with its reflection so that both map to the same
+        fingerprint.
+        :return: tuple - rows of the arrangement (or of its reflection) as strings, blank positions as ' '
+        '''
+        return min(self.getRows(), self.getColumns())
+    def getStateKey(self):
+        '''
+        Canonical, hashable key of a partial crossword: its fingerprint plus the words that still have to be inserted.
+        :return: tuple - (fingerprint, sorted tuple of words to insert)
+        '''
+        return self.getFingerprint(), tuple(sorted(self.wordsToInsert))
 
     def isValid(self):
         '''
         Checks validity of crossword; it must contain only, and all of, the words that were meant to be inserted
         :return: bool - True if crossword is valid, False if crossword is invalid
         '''
+        wordsSet = set(self.allWords)
         wordsInCrossword = []
-        # read & record words across each row
-        for row in range(self.minRow, self.maxRow + 1):
-            rowChars = ''
-            for col in range(self.minCol, self.maxCol + 1):
-                try:
-                    rowChars += self.positionsDict[(row, col)]
-                except KeyError:
-                    rowChars += '/'
-            wordsInRow = rowChars.split('/')
-            # check for words that were not meant to be inserted
-            for word in wordsInRow:
-                if len(word) < 2:
-                    continue
-                elif word in wordsSet:
-                    wordsInCrossword.append(word)
-                else:
-                    return False
-        # read & record words down each column
-        for col in range(self.minCol, self.maxCol + 1):
-            colChars = ''
-            for row in range(self.minRow, self.maxRow + 1):
-                try:
-                    colChars += self.positionsDict[(row, col)]
-                except KeyError:
-                    colChars += '/'
-            wordsInCol = colChars.split('/')
+        # read & record words across each row and down each column
+        for chars in self.getRows() + self.getColumns():
             # check for words that were not meant to be inserted
-            for word in wordsInCol:
+            for word in chars.split():
                 if len(word) < 2:
                     continue
                 elif word in wordsSet:
@@ -163,91 +371,1580 @@ class Crossword(object):
                     return False
         # check for missing words or unintended duplicates by comparing the sorted list of words in the
         # crossword with the sorted list of words that were meant to be inserted
-        return sorted(wordsInCrossword) == wordsList
+        return tuple(sorted(wordsInCrossword)) == self.allWords
 
     def printCrossword(self):
-        array = np.full((self.maxRow - self.minRow + 1, self.maxCol - self.minCol + 1), ' ')
-        for row, col in self.getPositionsDict():
-            array[row - self.minRow, col - self.minCol] = self.getPositionsDict()[(row, col)]
-        print(pd.DataFrame(array).to_string(header=False, index=False))
+        print(crosswordRender.renderText(self))
         print('size: ' + str(self.getSize()) + '\n')
 
 
-def dfs(crossword):
+def crosswordFromPlacements(placements, maxHeight=None, maxWidth=None):
+    '''
+    Rebuilds a crossword from its placed words, inserting them in order (each one must cross a word placed before
+    it). A seed crossword starts with its first word 'across', so if the first word is placed 'down', the transpose is
+    built, then transposed back.
+    :param placements: list - (word, (row, col), orientation) of every word, as returned by "getPlacedWords"
+    :param maxHeight: int - maximum number of rows of the crossword (None for no limit)
+    :param maxWidth: int - maximum number of columns of the crossword (None for no limit)
+    :return: Crossword object, or None if a word could not be inserted
+    '''
+    transpose = placements[0][2] == 1
+    if transpose:
+        placements = [(word, (col, row), 1 - orientation) for word, (row, col), orientation in placements]
+    (anchorRow, anchorCol) = placements[0][1]
+    crossword = Crossword(wordsList=[word for word, position, orientation in placements], maxHeight=maxHeight,
+                          maxWidth=maxWidth)
+    for word, (row, col), orientation in placements[1:]:
+        if not crossword.insertWord(0, (row - anchorRow, col - anchorCol), orientation):
+            return None
+    if transpose:
+        return Crossword(parentCrossword=crossword, transpose=True)
+    return crossword
+
+
+def infeasibilityReason(words, maxHeight=None, maxWidth=None):
+    '''
+    Quick check, run before the search starts, for lists of words that can never form a valid crossword. Every check
+    is a necessary condition for a valid crossword, so a list that can be arranged is never rejected (a list that
+    cannot be arranged may still pass, and is then rejected by the search).
+    :param words: list - upper-case words to be inserted into the crossword
+    :param maxHeight: int - maximum number of rows of the crossword (None for no limit)
+    :param maxWidth: int - maximum number of columns of the crossword (None for no limit)
+    :return: str - None if no reason was found, otherwise one of the following reason codes:
+        'noWords' - the list is empty
+        'invalidCharacters' - a word contains a character other than the letters A-Z
+        'wordTooShort' - a word has fewer than 2 letters; "isValid" never reads back a run of 1 letter, so the sorted
+                         words read from the crossword could never match the list
+        'wordTooLong' - a word is longer than both sides of the frame
+        'disconnected' - the words cannot all be connected, as some words share no letter with the others
+        'tooFewCrossings' - connecting n words takes at least n - 1 crossings, each pairing one letter of a word with
+                            the same letter of another word, and the words do not have enough such pairs
     '''
-    Depth first search. At each level, a new Crossword object is created as an update to the parent crossword.
-    The next word is inserted at every position (& orientation) where the word and the parent crossword share
-    a letter. If the word could not be inserted because it was blocked by an existing word, we return up one
-    level to the parent crossword. When a complete, valid, and unique crossword is discovered, it is stored in
-    a dictionary called "validCrosswords", and a dictionary of the letters occupying each position (and the
-    reflection of this arrangement) is stored in a hashable list called "alreadyDiscovered".
+    if not words:
+        return 'noWords'
+    for word in words:
+        if not set(word) <= set(string.ascii_uppercase):
+            return 'invalidCharacters'
+        if len(word) < 2:
+            return 'wordTooShort'
+        if maxHeight is not None and maxWidth is not None and len(word) > max(maxHeight, maxWidth):
+            return 'wordTooLong'
+
+    # walk the graph linking the words that share a letter, starting from the first word
+    letterSets = [set(word) for word in words]
+    connectedWords = {0}
+    wordsToVisit = [0]
+    while wordsToVisit:
+        wordIndex = wordsToVisit.pop()
+        for otherIndex, otherLetters in enumerate(letterSets):
+            if otherIndex not in connectedWords and letterSets[wordIndex] & otherLetters:
+                connectedWords.add(otherIndex)
+                wordsToVisit.append(otherIndex)
+    if len(connectedWords) < len(words):
+        return 'disconnected'
+
+    # a letter that appears "total" times over all the words, at most "most" times in one word, can be used by at most
+    # min(total // 2, total - most) crossings: every crossing takes one of its occurrences from each of two words
+    totalCounts = collections.Counter()
+    mostCounts = collections.Counter()
+    for word in words:
+        letterCounts = collections.Counter(word)
+        totalCounts.update(letterCounts)
+        for char, count in letterCounts.items():
+            mostCounts[char] = max(mostCounts[char], count)
+    maxCrossings = sum([min(total // 2, total - mostCounts[char]) for char, total in totalCounts.items()])
+    if maxCrossings < len(words) - 1:
+        return 'tooFewCrossings'
+    return None
+
+
+class CrossingIndex(object):
+    def __init__(self, words):
+        '''
+        Precomputes, once per list of words, how every pair of words can cross, so the search only tries insertions
+        where the word to insert really meets a word already on the board.
+        :param words: list - upper-case words to be inserted into the crossword
+        '''
+        distinctWords = sorted(set(words))
+        # letter multiset of each word, and the indices of each letter in each word
+        self.letterCounts = {word: collections.Counter(word) for word in distinctWords}
+        letterIndices = {}
+        for word in distinctWords:
+            letterIndices[word] = {}
+            for index, char in enumerate(word):
+                letterIndices[word].setdefault(char, []).append(index)
+        # (wordA, wordB): pairs (i, j) such that wordA[i] == wordB[j], i.e. wordA can cross wordB there
+        self.crossings = {}
+        for wordA in distinctWords:
+            for wordB in distinctWords:
+                self.crossings[(wordA, wordB)] = tuple(
+                    (i, j) for char in sorted(self.letterCounts[wordA] & self.letterCounts[wordB])
+                    for i in letterIndices[wordA][char] for j in letterIndices[wordB][char])
+        # number of ways each word can cross the other words of the list; the fewer, the more constrained the word
+        self.crossingCounts = {word: sum([len(self.crossings[(word, otherWord)]) for otherWord in words]) -
+                               len(self.crossings[(word, word)]) for word in distinctWords}
+
+    def getLetterCounts(self, word):
+        return self.letterCounts[word]
+    def getCrossings(self, wordA, wordB):
+        return self.crossings[(wordA, wordB)]
+    def getCrossingCount(self, word):
+        return self.crossingCounts[word]
+
+
+def wordInsertions(crossword, crossingIndex, wordIndex):
+    '''
+    Generates the insertions of one of the words to insert that cross a word already on the board at a shared letter.
+    An insertion that meets a placed word in the same direction could never be valid: "isValid" reads every word back
+    as its own run, and the placed word would be part of a longer run.
     :param crossword: Crossword object - the parent crossword
-    :return: None
+    :param crossingIndex: CrossingIndex object - index built from the words of crossword
+    :param wordIndex: int - index in the crossword's words to insert of the word to insert
+    :return: generator of tuples (insertPosition, insertOrientation, crossingChar); crossingChar is a letter the word
+             shares with the board there
+    '''
+    word = crossword.getWordsToInsert()[wordIndex]
+    for placedWord, (row, col), orientation in crossword.getPlacedWords():
+        for i, j in crossingIndex.getCrossings(word, placedWord):
+            # cross the placed word at its letter j, in the other direction
+            if orientation == 0:
+                yield (row - i, col + j), 1, word[i]
+            else:
+                yield (row + j, col - i), 0, word[i]
+
+
+def candidateInsertions(crossword, crossingIndex):
     '''
+    Generates the insertions tried by the order-independent search: each distinct word that has not been inserted yet
+    is inserted at every position (& orientation) where it meets a word on the board (see "wordInsertions"). The
+    crossword may be updated in between, as long as it is restored before the next insertion is generated.
+    :param crossword: Crossword object - the parent crossword
+    :param crossingIndex: CrossingIndex object - index built from the words of crossword
+    :return: generator of tuples (insertIndex, insertPosition, insertOrientation) to pass to "insertWord"
+    '''
+    triedWords = set()
+    for wordIndex, word in enumerate(crossword.getWordsToInsert()):
+        if word in triedWords:
+            continue
+        triedWords.add(word)
+        for insertPosition, insertOrientation, crossingChar in wordInsertions(crossword, crossingIndex, wordIndex):
+            yield wordIndex, insertPosition, insertOrientation
+
+
+def heuristicInsertions(crossword, crossingIndex):
+    '''
+    Generates the insertions tried by the order-independent search in most-constrained-first order: the words that
+    meet the board at the fewest positions (& orientations) come first, and among those the words that can cross the
+    other words of the list in the fewest ways. The insertions of each word keep the order of "wordInsertions". The
+    words are ranked by counting their insertions, without trying any of them on the crossword.
+    :param crossword: Crossword object - the parent crossword
+    :param crossingIndex: CrossingIndex object - index built from the words of crossword
+    :return: generator of tuples (insertIndex, insertPosition, insertOrientation) to pass to "insertWord"
+    '''
+    rankedWords = []
+    triedWords = set()
+    for wordIndex, word in enumerate(crossword.getWordsToInsert()):
+        if word in triedWords:
+            continue
+        triedWords.add(word)
+        # distinct positions (& orientations) where the word meets the board, in the order they were generated
+        insertions = list(dict.fromkeys([(insertPosition, insertOrientation) for insertPosition, insertOrientation,
+                                         crossingChar in wordInsertions(crossword, crossingIndex, wordIndex)]))
+        if insertions:
+            rankedWords.append((len(insertions), crossingIndex.getCrossingCount(word), wordIndex, insertions))
+    rankedWords.sort(key=lambda rankedWord: rankedWord[:2])
+    for insertionsCount, crossingCount, wordIndex, insertions in rankedWords:
+        for insertPosition, insertOrientation in insertions:
+            yield wordIndex, insertPosition, insertOrientation
+
 
-    # if parent crossword could not be updated correctly with current position/orientation of inserted word
-    if not crossword.getValidInitialization():
+def uniquePermutations(words):
+    '''
+    Generates every distinct order of words once; unlike itertools.permutations, orders that only swap two copies of
+    the same word are not repeated.
+    :param words: list - words to order
+    :return: generator of tuples of words
+    '''
+    if not words:
+        yield ()
         return
+    for index, word in enumerate(words):
+        if word in words[:index]:
+            continue
+        for order in uniquePermutations(words[:index] + words[index + 1:]):
+            yield (word,) + order
+
+
+class SearchStats(object):
+    def __init__(self):
+        '''
+        Counters of where a search spends its effort, collected by a "CrosswordSearch" created with collectStats=True.
+        '''
+        # partial crosswords expanded, by number of words placed
+        self.nodesPerDepth = collections.Counter()
+        # insertions rejected by "insertWord" (blocked, running into a word, stray letters, out of the frame)
+        self.insertRejections = 0
+        # partial crosswords pruned by the lower bound of the 'IDEAL' search
+        self.boundPrunes = 0
+        # partial crosswords skipped because they had already been expanded
+        self.statesSkipped = 0
+        # complete crosswords rejected by "isValid"
+        self.leafRejections = 0
+        # valid crosswords dropped because they had already been found
+        self.duplicatesDropped = 0
+        # seconds spent in each phase: 'setup' (building the search), 'search' (running it, including the time the
+        # caller spends between two crosswords), 'leafChecks' (checking complete crosswords) and, in a parallel search,
+        # 'workerSearch' (the worker processes searching, added up over the processes)
+        self.phaseSeconds = collections.Counter()
+
+    def merge(self, otherStats):
+        '''
+        Adds the counters of another search (e.g. of a worker process) to these counters.
+        :param otherStats: SearchStats object - the other counters
+        :return: None
+        '''
+        self.nodesPerDepth.update(otherStats.nodesPerDepth)
+        self.insertRejections += otherStats.insertRejections
+        self.boundPrunes += otherStats.boundPrunes
+        self.statesSkipped += otherStats.statesSkipped
+        self.leafRejections += otherStats.leafRejections
+        self.duplicatesDropped += otherStats.duplicatesDropped
+        self.phaseSeconds.update(otherStats.phaseSeconds)
+
+    def asDict(self):
+        '''
+        :return: dict - the counters, as plain values (e.g. to be stored as JSON)
+        '''
+        return {'nodesPerDepth': dict(sorted(self.nodesPerDepth.items())), 'insertRejections': self.insertRejections,
+                'boundPrunes': self.boundPrunes, 'statesSkipped': self.statesSkipped,
+                'leafRejections': self.leafRejections, 'duplicatesDropped': self.duplicatesDropped,
+                'phaseSeconds': {phase: round(seconds, 4) for phase, seconds in self.phaseSeconds.items()}}
 
-    # if crossword is complete
-    if not crossword.getWordsToInsert():
+
+class CrosswordSearch(object):
+    # the node budget, the time budget and the cancellation token are checked once every this many nodes
+    checkInterval = 1024
+    # settings of "generateCrosswords" that this engine takes
+    searchParameters = ('searchMode', 'orderIndependent', 'workers')
+
+    def __init__(self, words, searchMode='ALL', orderIndependent=True, workers=1, maxNodes=None, maxSeconds=None,
+                 cancelEvent=None, progressCallback=None, progressInterval=1.0, heuristicOrder=False, maxHeight=None,
+                 maxWidth=None, collectStats=False):
+        '''
+        Holds the settings and the state of one search. Nothing is searched until "search" is iterated.
+        :param words: list - words to be inserted into the crossword, in any order and case
+        :param searchMode: str - 'ALL' to find every arrangement, 'FAST' to stop at the first one, 'IDEAL' to search
+                                 only for arrangements smaller than the smallest one found so far
+        :param orderIndependent: bool - if True, search over the set of words not yet inserted instead of running a
+                                        DFS for every permutation of words
+        :param workers: int - number of processes to spread the search over; 1 runs the search in this process
+        :param maxNodes: int - stop the search after (about) this many partial crosswords have been expanded
+        :param maxSeconds: float - stop the search after (about) this many seconds
+        :param cancelEvent: threading.Event or multiprocessing.Event - stop the search once it is set
+        :param progressCallback: callable - called with a dict describing each progress event (see "emitEvent")
+        :param progressInterval: float - minimum number of seconds between two 'progress' events
+        :param heuristicOrder: bool - if True, start from the word that can cross the other words in the fewest
+                                      ways, and try the most constrained words first (see "heuristicInsertions");
+                                      the same crosswords are found, in a different order
+        :param maxHeight: int - only search for crosswords of at most this many rows (None for no limit)
+        :param maxWidth: int - only search for crosswords of at most this many columns (None for no limit); any
+                               insertion taking the crossword out of the frame is pruned. A crossword that only fits
+                               the frame transposed is yielded transposed
+        :param collectStats: bool - if True, count where the search spends its effort in "stats" (see "SearchStats");
+                                    if False, "stats" is None, and the counting costs one test per node
+        '''
+        setupStartTime = time.perf_counter()
+        self.wordsList = sorted([word.upper() for word in words])
+        self.searchMode = searchMode
+        self.orderIndependent = orderIndependent
+        self.heuristicOrder = heuristicOrder
+        self.maxHeight = maxHeight
+        self.maxWidth = maxWidth
+        # how every pair of words can cross, shared by every node of the search
+        self.crossingIndex = CrossingIndex(self.wordsList)
+        self.workers = workers
+        self.maxNodes = maxNodes
+        self.maxSeconds = maxSeconds
+        self.cancelEvent = cancelEvent
+        self.progressCallback = progressCallback
+        self.progressInterval = progressInterval
+        # why the search stopped: None while it runs, then 'completed', 'found' (FAST), 'maxNodes', 'maxSeconds',
+        # 'cancelled', 'closed' (the caller stopped consuming the crosswords) or 'infeasible'
+        self.stopReason = None
+        # reason code of "infeasibilityReason" if the words can never form a crossword, None otherwise
+        self.infeasibility = infeasibilityReason(self.wordsList, maxHeight, maxWidth)
+        # partial crosswords expanded by this process, and how many of them have been added to "sharedNodes"
+        self.nodesExpanded = 0
+        self.nodesReported = 0
+        # partial crosswords expanded by all the processes of the search
+        self.sharedNodes = multiprocessing.Value('q', 0)
+        self.rootsFinished = 0
+        self.solutionsFound = 0
+        self.startTime = None
+        self.deadline = None
+        self.lastProgressTime = None
+        # fingerprints of the crosswords found so far (the same for a crossword and its reflection)
+        self.alreadyDiscovered = set()
+        # keys of the partial crosswords expanded by the order-independent search
+        self.expandedStates = set()
+        # smallest size found so far (0 if none yet), and a flag set to 1 once the search should stop; both are
+        # shared with the worker processes of a parallel search
+        self.bestSize = multiprocessing.RawValue('i', 0)
+        self.stopSearch = multiprocessing.RawValue('b', 0)
+        self.stats = None
+        if collectStats:
+            self.stats = SearchStats()
+            self.stats.phaseSeconds['setup'] += time.perf_counter() - setupStartTime
+
+    def search(self):
+        '''
+        Runs the search lazily: each valid, unique crossword is yielded as soon as it is found, and the search goes no
+        further than the crosswords the caller consumes. In 'IDEAL' mode every crossword yielded is smaller than the
+        previous one, so the last one is the smallest; in 'FAST' mode only one crossword is yielded.
+        If a node or time budget runs out, or the search is cancelled, the search stops early: the crosswords yielded
+        up to then are the best ones found, and "stopReason" says why the search stopped. If the words can never
+        form a crossword, nothing is searched and "infeasibility" says why.
+        :return: generator of Crossword objects (copies, which the search does not update any further)
+        '''
+        self.startTime = time.monotonic()
+        self.lastProgressTime = self.startTime
+        searchStartTime = time.perf_counter()
+        if self.maxSeconds is not None:
+            self.deadline = self.startTime + self.maxSeconds
+        self.emitEvent('started')
+        try:
+            # if the words can never form a crossword, there is nothing to search
+            if self.infeasibility is not None:
+                self.stopReason = 'infeasible'
+            elif self.workers == 1:
+                for seed in self.seedCrosswords():
+                    for foundCrossword in self.searchSubtree(seed):
+                        self.emitSolution(foundCrossword)
+                        yield foundCrossword
+                    self.rootsFinished += 1
+                    self.emitEvent('root')
+            else:
+                yield from self.searchParallel()
+        except GeneratorExit:
+            # the caller stopped consuming the crosswords
+            if self.stopReason is None:
+                self.stopReason = 'closed'
+            raise
+        finally:
+            self.flushNodes()
+            # if a worker process stopped the search, find out why
+            if self.stopReason is None and self.stopSearch.value:
+                self.checkBudget()
+            if self.stopReason is None:
+                self.stopReason = 'found' if self.stopSearch.value and self.searchMode == 'FAST' else 'completed'
+            if self.stats is not None:
+                self.stats.phaseSeconds['search'] += time.perf_counter() - searchStartTime
+            self.emitEvent('finished', stopReason=self.stopReason, infeasibility=self.infeasibility)
+
+    def searchParallel(self):
+        '''
+        Spreads the search over a pool of worker processes. While waiting for the workers, the budgets and the
+        cancellation token are checked at least once every "progressInterval" seconds.
+        :return: generator of Crossword objects
+        '''
+        # subtrees are handed out one at a time (many at a time for the small subtrees of the ordered search),
+        # so idle workers keep picking up the remaining ones; leaving the with block stops the workers
+        with multiprocessing.Pool(self.workers, initializer=initializeWorker,
+                                  initargs=(self.wordsList, self.searchMode, self.orderIndependent, self.bestSize,
+                                            self.stopSearch, self.sharedNodes, self.maxNodes, self.deadline,
+                                            self.heuristicOrder, self.stats is not None)) as pool:
+            results = pool.imap_unordered(searchSubtrees, self.batchSeeds(1 if self.orderIndependent else 64))
+            # size of the last crossword yielded; the workers report their crosswords in no particular order
+            smallestYieldedSize = None
+            allResultsReceived = False
+            try:
+                while True:
+                    try:
+                        rootsSearched, foundCrosswords, workerStats = results.next(timeout=self.progressInterval)
+                    except multiprocessing.TimeoutError:
+                        self.checkBudget()
+                        continue
+                    except StopIteration:
+                        allResultsReceived = True
+                        return
+                    if workerStats is not None:
+                        self.stats.merge(workerStats)
+                    for foundCrossword in foundCrosswords:
+                        if self.recordCrossword(foundCrossword):
+                            # if searching for the ideal crossword, only yield crosswords smaller than the previous one
+                            if self.searchMode == 'IDEAL':
+                                if smallestYieldedSize is not None and foundCrossword.getSize() >= smallestYieldedSize:
+                                    continue
+                                smallestYieldedSize = foundCrossword.getSize()
+                            self.emitSolution(foundCrossword)
+                            yield foundCrossword
+                            # if searching for the fastest crossword, stop as soon as one has been received (the
+                            # workers stop on their own once one of them has found it)
+                            if self.searchMode == 'FAST':
+                                return
+                    self.rootsFinished += rootsSearched
+                    self.emitEvent('root')
+                    self.checkBudget()
+            finally:
+                # if leaving early, stop the workers and wait for their last results before the pool is terminated: a
+                # worker terminated while it sends a result leaves the result queue locked, and the pool hangs
+                if not allResultsReceived:
+                    self.stopSearch.value = 1
+                    for rootsSearched, foundCrosswords, workerStats in results:
+                        if workerStats is not None:
+                            self.stats.merge(workerStats)
+
+    def seedCrosswords(self):
+        '''
+        Generates the roots of the search. Every crossword contains every word, and can be built up from any one of
+        them, so the search always starts from the same root word, placed 'across' at (0, 0): every crossword is then
+        found once up to translation and transposition, instead of once from each word (and again as its transpose).
+        The order-independent search starts once from the root word; for the parallel search this root is expanded by
+        one level so there are enough subtrees to keep every worker busy. The ordered search starts once for each
+        distinct order of the other words.
+        :return: generator of Crossword objects
+        '''
+        # the heuristic ordering starts from the most constrained word
+        rootWord = min(self.wordsList, key=self.crossingIndex.getCrossingCount) if self.heuristicOrder \
+            else self.wordsList[0]
+        otherWords = self.wordsList.copy()
+        otherWords.remove(rootWord)
+        if self.orderIndependent:
+            rootCrossword = Crossword(wordsList=[rootWord] + otherWords, maxHeight=self.maxHeight,
+                                      maxWidth=self.maxWidth)
+            if self.workers == 1 or not otherWords:
+                yield rootCrossword
+                return
+            for insertIndex, insertPosition, insertOrientation in self.insertions(rootCrossword):
+                # if the search has been stopped, there is nothing left to seed
+                if self.stopSearch.value:
+                    return
+                childCrossword = Crossword(parentCrossword=rootCrossword, insertPosition=insertPosition,
+                                           insertOrientation=insertOrientation, insertIndex=insertIndex)
+                if childCrossword.getValidInitialization():
+                    stateKey = childCrossword.getStateKey()
+                    if stateKey not in self.expandedStates:
+                        self.expandedStates.add(stateKey)
+                        yield childCrossword
+        else:
+            # orders come out in the order of the words they permute, so the orders starting with the most
+            # constrained words are searched first
+            if self.heuristicOrder:
+                otherWords.sort(key=self.crossingIndex.getCrossingCount)
+            for order in uniquePermutations(otherWords):
+                # if the search has been stopped, there is nothing left to seed
+                if self.stopSearch.value:
+                    return
+                yield Crossword(wordsList=[rootWord] + list(order), maxHeight=self.maxHeight, maxWidth=self.maxWidth)
+
+    def batchSeeds(self, batchSize):
+        '''
+        Groups the roots of the search into lists, each list is one task of the parallel search.
+        :param batchSize: int - number of roots per list
+        :return: generator of lists of Crossword objects
+        '''
+        batch = []
+        for seed in self.seedCrosswords():
+            batch.append(seed)
+            if len(batch) == batchSize:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def insertions(self, crossword):
+        '''
+        :param crossword: Crossword object - the parent crossword
+        :return: generator of the insertions tried by the order-independent search below crossword
+        '''
+        if self.heuristicOrder:
+            return heuristicInsertions(crossword, self.crossingIndex)
+        return candidateInsertions(crossword, self.crossingIndex)
+
+    def searchSubtree(self, crossword):
+        '''
+        :param crossword: Crossword object - the root of the subtree
+        :return: generator of the valid, unique crosswords found below crossword (copies)
+        '''
+        if self.orderIndependent:
+            return self.dfsUnordered(crossword)
+        return self.dfs(crossword)
+
+    def dfs(self, crossword):
+        '''
+        Depth first search. At each level, the next word is inserted in place at every position (& orientation) where
+        it meets a word of the parent crossword (see "wordInsertions"), and taken out again once the level below has
+        been searched.
+        If the word could not be inserted because it was blocked by an existing word, that position is skipped. When a
+        complete, valid, and unique crossword is discovered, a copy is yielded, and its fingerprint (shared with the
+        reflection of this arrangement) is stored in a set called "alreadyDiscovered".
+        :param crossword: Crossword object - the parent crossword
+        :return: generator of Crossword objects
+        '''
+
+        # if parent crossword could not be updated correctly with current position/orientation of inserted word
+        if not crossword.getValidInitialization():
+            if self.stats is not None:
+                self.stats.insertRejections += 1
+            return
+
+        # if searching for the fastest crossword and one has already been found, or the search has been stopped
+        if self.stopSearch.value:
+            return
+
+        # if a budget has run out, or the search has been cancelled
+        self.nodesExpanded += 1
+        if not self.nodesExpanded % self.checkInterval and self.checkBudget():
+            return
+        if self.stats is not None:
+            self.stats.nodesPerDepth[crossword.getPlacedCount()] += 1
+
+        # if searching for the ideal crossword, and no completion can be smaller than the smallest one found so far
+        if self.searchMode == 'IDEAL' and self.bestSize.value and crossword.getLowerBound() >= self.bestSize.value:
+            if self.stats is not None:
+                self.stats.boundPrunes += 1
+            return
+
+        # if crossword is complete
+        if not crossword.getWordsToInsert():
+            if self.recordCrossword(crossword):
+                yield crossword.getFramedCopy()
+            return
+
+        # if crossword is not yet complete
+        for insertPosition, insertOrientation, crossingChar in wordInsertions(crossword, self.crossingIndex, 0):
+            if crossword.insertWord(0, insertPosition, insertOrientation):
+                yield from self.dfs(crossword)
+                crossword.removeLastWord()
+            elif self.stats is not None:
+                self.stats.insertRejections += 1
+
+    def dfsUnordered(self, crossword):
+        '''
+        Order-independent depth first search. Instead of inserting the words in a fixed order, each level tries every
+        word that has not been inserted yet. Different insertion orders lead to the same partial crosswords, so the
+        canonical key of every expanded partial crossword is stored in a set called "expandedStates", and a partial
+        crossword that has already been expanded (possibly shifted or reflected) is not expanded again.
+        :param crossword: Crossword object - the parent crossword
+        :return: generator of Crossword objects
+        '''
+
+        # if parent crossword could not be updated correctly with current position/orientation of inserted word
+        if not crossword.getValidInitialization():
+            if self.stats is not None:
+                self.stats.insertRejections += 1
+            return
+
+        # if searching for the fastest crossword and one has already been found, or the search has been stopped
+        if self.stopSearch.value:
+            return
+
+        # if a budget has run out, or the search has been cancelled
+        self.nodesExpanded += 1
+        if not self.nodesExpanded % self.checkInterval and self.checkBudget():
+            return
+        if self.stats is not None:
+            self.stats.nodesPerDepth[crossword.getPlacedCount()] += 1
+
+        # if searching for the ideal crossword, and no completion can be smaller than the smallest one found so far
+        if self.searchMode == 'IDEAL' and self.bestSize.value and crossword.getLowerBound() >= self.bestSize.value:
+            if self.stats is not None:
+                self.stats.boundPrunes += 1
+            return
+
+        # if crossword is complete
+        if not crossword.getWordsToInsert():
+            if self.recordCrossword(crossword):
+                yield crossword.getFramedCopy()
+            return
+
+        # if this partial crossword has already been expanded
+        stateKey = crossword.getStateKey()
+        if stateKey in self.expandedStates:
+            if self.stats is not None:
+                self.stats.statesSkipped += 1
+            return
+        self.expandedStates.add(stateKey)
+
+        # if crossword is not yet complete
+        for insertIndex, insertPosition, insertOrientation in self.insertions(crossword):
+            if crossword.insertWord(insertIndex, insertPosition, insertOrientation):
+                yield from self.dfsUnordered(crossword)
+                crossword.removeLastWord()
+            elif self.stats is not None:
+                self.stats.insertRejections += 1
+
+    def flushNodes(self):
+        '''
+        Adds the partial crosswords expanded by this process since the last call to "sharedNodes".
+        :return: int - partial crosswords expanded by all the processes of the search
+        '''
+        with self.sharedNodes.get_lock():
+            self.sharedNodes.value += self.nodesExpanded - self.nodesReported
+            totalNodes = self.sharedNodes.value
+        self.nodesReported = self.nodesExpanded
+        return totalNodes
+
+    def checkBudget(self):
+        '''
+        Stops the search if the node budget or the time budget has run out, or the search has been cancelled, and
+        emits a 'progress' event if "progressInterval" seconds have passed since the last one.
+        :return: bool - True if the search has been stopped (for any reason)
+        '''
+        totalNodes = self.flushNodes()
+        if self.stopReason is None:
+            if self.cancelEvent is not None and self.cancelEvent.is_set():
+                self.stopReason = 'cancelled'
+            elif self.maxNodes is not None and totalNodes >= self.maxNodes:
+                self.stopReason = 'maxNodes'
+            elif self.deadline is not None and time.monotonic() >= self.deadline:
+                self.stopReason = 'maxSeconds'
+            if self.stopReason is not None:
+                self.stopSearch.value = 1
+        if self.progressCallback is not None and time.monotonic() - self.lastProgressTime >= self.progressInterval:
+            self.emitEvent('progress')
+        return bool(self.stopSearch.value)
+
+    def emitSolution(self, crossword):
+        '''
+        Counts a crossword about to be yielded, and emits a 'solution' event for it.
+        :param crossword: Crossword object - the crossword
+        :return: None
+        '''
+        self.solutionsFound += 1
+        if self.progressCallback is not None:
+            self.flushNodes()
+            self.emitEvent('solution', size=crossword.getSize())
+
+    def emitEvent(self, event, **fields):
+        '''
+        Passes a progress event to "progressCallback", if there is one. Every event is a dict with the keys 'event'
+        ('started', 'progress', 'solution', 'root' or 'finished'), 'nodesExpanded', 'rootsFinished', 'solutions',
+        'bestSize' (None if no crossword has been found yet) and 'elapsedSeconds', plus 'size' for 'solution' events
+        and 'stopReason' and 'infeasibility' for the 'finished' event.
+        :param event: str - the kind of event
+        :param fields: additional keys of the event
+        :return: None
+        '''
+        if self.progressCallback is None:
+            return
+        self.lastProgressTime = time.monotonic()
+        eventDict = {'event': event, 'nodesExpanded': self.sharedNodes.value, 'rootsFinished': self.rootsFinished,
+                     'solutions': self.solutionsFound, 'bestSize': self.bestSize.value or None,
+                     'elapsedSeconds': round(self.lastProgressTime - self.startTime, 3)}
+        eventDict.update(fields)
+        self.progressCallback(eventDict)
+
+    def bestCrosswords(self):
+        '''
+        Runs the search until it completes or stops early, keeping only the smallest crosswords found.
+        :return: list - the smallest crosswords found (empty if none was found); "stopReason" says whether the
+                        search completed
+        '''
+        best = []
+        for crossword in self.search():
+            if not best or crossword.getSize() < best[0].getSize():
+                best = [crossword]
+            elif crossword.getSize() == best[0].getSize():
+                best.append(crossword)
+        return best
+
+    def checkCrossword(self, crossword):
+        '''
+        :param crossword: Crossword object - a crossword with no words left to insert
+        :return: bool - True if crossword is valid and has not been discovered yet
+        '''
         # if crossword is valid
-        if crossword.isValid():
-            # if crossword is unique
-            crossword.setReIndexedPositionsDict()
-            if crossword.getReIndexedPositionsDict() not in alreadyDiscovered \
-                    and crossword.getReflectedPositionsDict() not in alreadyDiscovered:
-                # add crossword to alreadyDiscovered
-                alreadyDiscovered.append(crossword.getReIndexedPositionsDict())
-                # add crossword to validCrosswords according to its size
-                try:
-                    validCrosswords[crossword.getSize()].append(crossword)
-                except KeyError:
-                    validCrosswords[crossword.getSize()] = [crossword]
-                    # if new smallest crossword discovered, print it
-                    if crossword.getSize() == min(validCrosswords):
-                        print('Smallest crossword discovered so far:')
-                        crossword.printCrossword()
-        return
+        if not crossword.isValid():
+            if self.stats is not None:
+                self.stats.leafRejections += 1
+            return False
+        # if crossword is unique
+        if crossword.getFingerprint() in self.alreadyDiscovered:
+            if self.stats is not None:
+                self.stats.duplicatesDropped += 1
+            return False
+        return True
+
+    def recordCrossword(self, crossword):
+        '''
+        Records a complete crossword if it is valid and has not been discovered yet.
+        :param crossword: Crossword object - a crossword with no words left to insert
+        :return: bool - True if crossword is valid and unique
+        '''
+        if self.stats is not None:
+            checkStartTime = time.perf_counter()
+            isUnique = self.checkCrossword(crossword)
+            self.stats.phaseSeconds['leafChecks'] += time.perf_counter() - checkStartTime
+        else:
+            isUnique = self.checkCrossword(crossword)
+        if not isUnique:
+            return False
+        # add crossword to alreadyDiscovered
+        self.alreadyDiscovered.add(crossword.getFingerprint())
+        # if searching for the fastest crossword, this one will do
+        if self.searchMode == 'FAST':
+            self.stopSearch.value = 1
+        # update the smallest size, shared with the other processes (a lost update only weakens pruning)
+        if not self.bestSize.value or crossword.getSize() < self.bestSize.value:
+            self.bestSize.value = crossword.getSize()
+        return True
+
+
+class BeamSearch(object):
+    # settings of "generateCrosswords" that this engine takes
+    searchParameters = ()
+
+    def __init__(self, words, beamWidth=4, lookahead=2, restarts=3, seed=None, maxNodes=None, maxSeconds=None,
+                 cancelEvent=None, maxHeight=None, maxWidth=None):
+        '''
+        Beam search for long lists of words (dozens to hundreds), where the exhaustive search of "CrosswordSearch"
+        cannot finish. The crossword is grown one word at a time, with the same insertion rules as the exhaustive
+        search, and at each step only the "beamWidth" best partial crosswords are kept: the smallest ones, then those
+        with the smallest bounding box area, then those with the most crossings. Complete crosswords are checked with
+        "isValid". As it never backtracks, letters may only touch the letters of the words they cross (see
+        "strictAdjacency"). The crosswords found are good ones, but not provably the smallest.
+        :param words: list - words to be inserted into the crossword, in any order and case
+        :param beamWidth: int - number of partial crosswords kept at each step
+        :param lookahead: int - number of words, taken in the word order of the current run, that each partial
+                                crossword tries to insert at each step; the other words are only tried if none of
+                                these can be inserted
+        :param restarts: int - number of runs, each with a different random word order
+        :param seed: int - seed of the random word orders and tie-breaks, so that runs can be reproduced (a run
+                           stopped by "maxSeconds" or "cancelEvent" may not be)
+        :param maxNodes: int - stop the search after (about) this many insertions tried
+        :param maxSeconds: float - stop the search after (about) this many seconds
+        :param cancelEvent: threading.Event or multiprocessing.Event - stop the search once it is set
+        :param maxHeight: int - only keep crosswords of at most this many rows (None for no limit)
+        :param maxWidth: int - only keep crosswords of at most this many columns (None for no limit); see
+                               "CrosswordSearch"
+        '''
+        self.wordsList = sorted([word.upper() for word in words])
+        self.beamWidth = beamWidth
+        self.lookahead = lookahead
+        self.restarts = restarts
+        self.seed = seed
+        self.maxNodes = maxNodes
+        self.maxSeconds = maxSeconds
+        self.cancelEvent = cancelEvent
+        self.maxHeight = maxHeight
+        self.maxWidth = maxWidth
+        self.random = random.Random(seed)
+        # reason code of "infeasibilityReason" if the words can never form a crossword, None otherwise
+        self.infeasibility = infeasibilityReason(self.wordsList, maxHeight, maxWidth)
+        # why the search stopped: None while it runs, then 'completed', 'maxNodes', 'maxSeconds', 'cancelled', 'closed'
+        # or 'infeasible'
+        self.stopReason = None
+        # insertions tried so far
+        self.nodesExpanded = 0
+        self.deadline = None
+        if self.infeasibility is None:
+            self.crossingIndex = CrossingIndex(self.wordsList)
+            # every partial crossword of the beam is a copy that receives a single insertion, which reaches at most
+            # one word length beyond the bounding box; one more blank position is read around it
+            self.boardMargin = max([len(word) for word in self.wordsList]) + 2
+
+    def search(self):
+        '''
+        Runs the beam search "restarts" times, yielding each complete, valid crossword that is better (smaller, then
+        with a smaller area, then with more crossings) than the ones yielded before, so the last one is the best.
+        :return: generator of Crossword objects
+        '''
+        if self.maxSeconds is not None:
+            self.deadline = time.monotonic() + self.maxSeconds
+        bestScore = None
+        try:
+            # if the words can never form a crossword, there is nothing to search
+            if self.infeasibility is not None:
+                self.stopReason = 'infeasible'
+                return
+            for restart in range(self.restarts):
+                finalBeam = self.searchOnce(self.wordOrder())
+                for score, crossword in sorted([(self.getScore(crossword), crossword) for crossword in finalBeam
+                                                if crossword.isValid()], key=lambda scored: scored[0]):
+                    if bestScore is None or score < bestScore:
+                        bestScore = score
+                        yield crossword.getFramedCopy()
+                if self.stopReason is not None:
+                    return
+        except GeneratorExit:
+            # the caller stopped consuming the crosswords
+            if self.stopReason is None:
+                self.stopReason = 'closed'
+            raise
+        finally:
+            if self.stopReason is None:
+                self.stopReason = 'completed'
+
+    def bestCrosswords(self):
+        '''
+        Runs the search until it completes or stops early.
+        :return: list - the best crossword found (empty if none was found)
+        '''
+        best = []
+        for crossword in self.search():
+            best = [crossword]
+        return best
+
+    def wordOrder(self):
+        '''
+        Random word order of one run. It starts from one of the longest words, and each next word is the one sharing
+        the most letters (counted with multiplicity) with the words ordered before it, so that most words can cross
+        the ones before them; ties are broken at random.
+        :return: list - the words, in the order the run tries to insert them
+        '''
+        remainingWords = self.wordsList.copy()
+        self.random.shuffle(remainingWords)
+        order = [max(remainingWords, key=len)]
+        remainingWords.remove(order[0])
+        orderedCounts = collections.Counter(order[0])
+        while remainingWords:
+            nextWord = max(remainingWords, key=lambda word: sum(
+                (self.crossingIndex.getLetterCounts(word) & orderedCounts).values()))
+            order.append(nextWord)
+            remainingWords.remove(nextWord)
+            orderedCounts += self.crossingIndex.getLetterCounts(nextWord)
+        return order
+
+    def searchOnce(self, order):
+        '''
+        One run of the beam search.
+        :param order: list - the words, in the order the run tries to insert them
+        :return: list - the complete crosswords of the final beam (empty if every partial crossword got stuck, or the
+                        search was stopped)
+        '''
+        # each partial crossword of the beam comes with its letter anchors (see "addAnchors") and the set of its
+        # placed words; every partial crossword grows from the same root word, placed the same way, so two of them
+        # with the same placed words are the same crossword
+        rootCrossword = Crossword(wordsList=order, boardMargin=self.boardMargin, strictAdjacency=True,
+                                  maxHeight=self.maxHeight, maxWidth=self.maxWidth)
+        beam = [(rootCrossword, self.addAnchors(rootCrossword, {}, order[0], (0, 0), 0),
+                 frozenset(rootCrossword.getPlacedWords()))]
+        while beam[0][0].getWordsToInsert():
+            # if a budget has run out, or the search has been cancelled
+            if self.cancelEvent is not None and self.cancelEvent.is_set():
+                self.stopReason = 'cancelled'
+                return []
+            if self.maxNodes is not None and self.nodesExpanded >= self.maxNodes:
+                self.stopReason = 'maxNodes'
+                return []
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                self.stopReason = 'maxSeconds'
+                return []
+            # score every legal insertion into every partial crossword of the beam
+            candidates = []
+            for beamIndex, (crossword, letterAnchors, placementsKey) in enumerate(beam):
+                wordsCount = len(crossword.getWordsToInsert())
+                if not self.scoreInsertions(crossword, letterAnchors, beamIndex, range(min(self.lookahead, wordsCount)),
+                                            candidates):
+                    self.scoreInsertions(crossword, letterAnchors, beamIndex, range(self.lookahead, wordsCount),
+                                         candidates)
+            # if no partial crossword can be extended
+            if not candidates:
+                return []
+            # keep the best distinct partial crosswords; a child is only built once it is known to be kept
+            candidates.sort()
+            newBeam = []
+            placementsKeys = set()
+            for score, beamIndex, insertIndex, placement in candidates:
+                crossword, letterAnchors, placementsKey = beam[beamIndex]
+                childPlacementsKey = placementsKey | {placement}
+                if childPlacementsKey in placementsKeys:
+                    continue
+                placementsKeys.add(childPlacementsKey)
+                word, insertPosition, insertOrientation = placement
+                childCrossword = Crossword(parentCrossword=crossword, insertPosition=insertPosition,
+                                           insertOrientation=insertOrientation, insertIndex=insertIndex,
+                                           boardMargin=self.boardMargin)
+                newBeam.append((childCrossword, self.addAnchors(childCrossword, letterAnchors, *placement),
+                                childPlacementsKey))
+                if len(newBeam) == self.beamWidth:
+                    break
+            beam = newBeam
+        return [crossword for crossword, letterAnchors, placementsKey in beam]
+
+    def addAnchors(self, crossword, letterAnchors, word, position, orientation):
+        '''
+        Letter anchors of a partial crossword: for each letter, the positions of that letter on the board where a word
+        could still cross the placed word they belong to (see "isCrossable"), each with the orientation of that placed
+        word. A word to insert can only cross the board at an anchor of one of its letters, so only those are visited
+        (see "anchorInsertions"). Inserting a word adds its own anchors, and can only close the anchors next to it, so
+        the tuples of the parent are shared, except those of the letters found next to the word.
+        :param crossword: Crossword object - the crossword with the word inserted
+        :param letterAnchors: dict - letter anchors of the crossword before the word was inserted
+        :param word: str - the inserted word
+        :param position: tuple (row, col) - position of the first letter of the word
+        :param orientation: int - 0 for 'across', 1 for 'down'
+        :return: dict - letter anchors of crossword
+        '''
+        wordPositions = [(position[0] + orientation * index, position[1] + (1 - orientation) * index)
+                         for index in range(len(word))]
+        touchedPositions = set(wordPositions)
+        for row, col in wordPositions:
+            touchedPositions.update([(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)])
+        childAnchors = letterAnchors.copy()
+        for char in {crossword.getLetter(touchedPosition) for touchedPosition in touchedPositions} - {' '}:
+            anchors = letterAnchors.get(char, ()) + tuple([(wordPosition, orientation) for wordPosition, wordChar
+                                                           in zip(wordPositions, word) if wordChar == char])
+            childAnchors[char] = tuple([anchor for anchor in anchors
+                                        if anchor[0] not in touchedPositions or crossword.isCrossable(*anchor)])
+        return childAnchors
+
+    def anchorInsertions(self, word, letterAnchors):
+        '''
+        Generates the insertions of a word that cross a placed word at a shared letter, as "wordInsertions" does, but
+        visiting only the anchors of the letters of the word.
+        :param word: str - the word to insert
+        :param letterAnchors: dict - letter anchors of the crossword (see "addAnchors")
+        :return: generator of tuples (insertPosition, insertOrientation)
+        '''
+        for index, char in enumerate(word):
+            for (row, col), orientation in letterAnchors.get(char, ()):
+                # cross the placed word at its letter, in the other direction
+                if orientation == 0:
+                    yield (row - index, col), 1
+                else:
+                    yield (row, col - index), 0
+
+    def scoreInsertions(self, crossword, letterAnchors, beamIndex, wordIndices, candidates):
+        '''
+        Tries every insertion of the given words into a partial crossword of the beam, and adds the legal ones to
+        candidates, with their score (see "getScore") and a random tie-breaker.
+        :param crossword: Crossword object - partial crossword of the beam; it is restored after every insertion
+        :param letterAnchors: dict - letter anchors of crossword (see "addAnchors")
+        :param beamIndex: int - index of crossword in the beam
+        :param wordIndices: range - indices in the crossword's words to insert of the words to try
+        :param candidates: list - (score, beamIndex, insertIndex, (word, insertPosition, insertOrientation)) tuples
+        :return: bool - True if any of the words could be inserted
+        '''
+        wordsToInsert = crossword.getWordsToInsert()
+        triedWords = set()
+        inserted = False
+        for wordIndex in wordIndices:
+            if wordsToInsert[wordIndex] in triedWords:
+                continue
+            triedWords.add(wordsToInsert[wordIndex])
+            for insertPosition, insertOrientation in self.anchorInsertions(wordsToInsert[wordIndex], letterAnchors):
+                self.nodesExpanded += 1
+                if crossword.insertWord(wordIndex, insertPosition, insertOrientation):
+                    candidates.append((self.getScore(crossword) + (self.random.random(),), beamIndex, wordIndex,
+                                       (wordsToInsert[wordIndex], insertPosition, insertOrientation)))
+                    crossword.removeLastWord()
+                    inserted = True
+        return inserted
+
+    def getScore(self, crossword):
+        '''
+        :param crossword: Crossword object - a partial or complete crossword
+        :return: tuple - (size, area of the bounding box, minus the number of crossings); smaller is better
+        '''
+        return crossword.getSize(), crossword.getArea(), -crossword.getCrossingCount()
+
+
+class ExactCoverSearch(object):
+    # the node budget, the time budget and the cancellation token are checked once every this many nodes (a node
+    # selects an option, which is far slower than an insertion of "CrosswordSearch")
+    checkInterval = 128
+    # frames with more options than this are not searched: their options would take too long to build and too much
+    # memory to hold (about 2 kB each)
+    maxOptions = 1 << 18
+    # settings of "generateCrosswords" that this engine takes
+    searchParameters = ('searchMode',)
+
+    def __init__(self, words, searchMode='ALL', maxNodes=None, maxSeconds=None, cancelEvent=None, maxHeight=None,
+                 maxWidth=None):
+        '''
+        Exact-cover search: the same placement problem as "CrosswordSearch", solved as an exact cover with colours on
+        a bounded, square frame. Every placement of a word (row, col, orientation) that fits in the frame is an
+        option; an option covers its word once (each word must be covered as many times as it appears), and colours
+        the positions of its letters with those letters, the positions just before and after the word (if they are
+        in the frame) blank, and its letter positions in its orientation (a position can only be taken by one word
+        per orientation). Selecting an option discards every option whose colours no longer agree with the board, so
+        the search knows at every node how many placements each remaining word has left, and gives up as soon as one
+        of them has none. Options are only selected where they cross the words already placed, so every crossword
+        is connected, and the crosswords are checked with "isValid" (letters touching side by side) once complete.
+        The first word is placed at the centre of a single frame large enough for any crossword of the words around
+        it. In 'IDEAL' mode, once a crossword has been found there, frames of increasing size, up to the size of that
+        crossword, are searched each for crosswords of exactly that size: they must touch the top and the left edge
+        (which removes their shifted copies), and the bottom or the right edge, so the first crossword found in them
+        is one of the smallest. When the crossword has a maximum height or width, or the single frame would have more
+        than "maxOptions" options, only such frames are searched, from the length of the longest word up (so they
+        only grow as large as the crosswords searched for), and the options that do not fit the maximum height and
+        width are left out. A frame with more than "maxOptions" options is not searched.
+        :param words: list - words to be inserted into the crossword, in any order and case
+        :param searchMode: str - 'ALL' to find every arrangement, 'FAST' to stop at the first one, 'IDEAL' to search
+                                 only for arrangements smaller than the ones found so far
+        :param maxNodes: int - stop the search after (about) this many partial crosswords have been expanded
+        :param maxSeconds: float - stop the search after (about) this many seconds; also checked while the options
+                                   of a frame are built
+        :param cancelEvent: threading.Event or multiprocessing.Event - stop the search once it is set; also checked
+                                                                        while the options of a frame are built
+        :param maxHeight: int - only search for crosswords of at most this many rows (None for no limit)
+        :param maxWidth: int - only search for crosswords of at most this many columns (None for no limit); see
+                               "CrosswordSearch"
+        '''
+        self.wordsList = sorted([word.upper() for word in words])
+        self.searchMode = searchMode
+        self.maxHeight = maxHeight
+        self.maxWidth = maxWidth
+        self.maxNodes = maxNodes
+        self.maxSeconds = maxSeconds
+        self.cancelEvent = cancelEvent
+        # reason code of "infeasibilityReason" if the words can never form a crossword, None otherwise
+        self.infeasibility = infeasibilityReason(self.wordsList, maxHeight, maxWidth)
+        # why the search stopped: None while it runs, then 'completed', 'found' (FAST), 'maxNodes', 'maxSeconds',
+        # 'cancelled', 'closed' (the caller stopped consuming the crosswords), 'infeasible' or 'tooLarge' (a frame
+        # to search had more than "maxOptions" options)
+        self.stopReason = None
+        # partial crosswords expanded so far
+        self.nodesExpanded = 0
+        self.deadline = None
+        # fingerprints of the crosswords found so far (the same for a crossword and its reflection)
+        self.alreadyDiscovered = set()
+        # sets of options already expanded in the current frame, as bitmasks
+        self.expandedStates = set()
+        # each distinct word and the number of times it has to be covered
+        self.distinctWords = sorted(set(self.wordsList))
+        self.wordCounts = [self.wordsList.count(word) for word in self.distinctWords]
+        # the first word is placed 'across'; the transposed crosswords, with it 'down', have the same fingerprints
+        self.anchorWord = self.distinctWords.index(max(self.distinctWords, key=len))
+
+    def search(self):
+        '''
+        Runs the search lazily: each valid, unique crossword is yielded as soon as it is found. In 'IDEAL' mode every
+        crossword yielded is smaller than the previous one, so the last one is the smallest; in 'FAST' mode only one
+        crossword is yielded.
+        :return: generator of Crossword objects
+        '''
+        if self.maxSeconds is not None:
+            self.deadline = time.monotonic() + self.maxSeconds
+        try:
+            # if the words can never form a crossword, there is nothing to search
+            if self.infeasibility is not None:
+                self.stopReason = 'infeasible'
+                return
+            # a crossword is no larger than its letters, and every word but one shares at least one of them
+            largestSize = sum([len(word) for word in self.wordsList]) - len(self.wordsList) + 1
+            smallestSize = max([len(word) for word in self.wordsList])
+            if self.maxHeight is not None or self.maxWidth is not None:
+                largestSize = min(largestSize, max(self.maxHeight or largestSize, self.maxWidth or largestSize))
+            # one frame holds every crossword, but its options grow with the square of the largest size: if it has too
+            # many, only the frames of increasing size are searched
+            elif self.countOptions(2 * largestSize - 1) <= self.maxOptions:
+                for crossword in self.searchFrame(2 * largestSize - 1, False):
+                    yield crossword
+                    if self.searchMode == 'FAST':
+                        self.stopReason = 'found'
+                        return
+                    # the smallest crossword is smaller than this one, or this one
+                    if self.searchMode == 'IDEAL':
+                        largestSize = crossword.getSize() - 1
+                        break
+                # if every crossword has been found (or none can be), or the search has been stopped
+                else:
+                    return
+            for frameSize in range(smallestSize, largestSize + 1):
+                for crossword in self.searchFrame(frameSize, True):
+                    yield crossword
+                    if self.searchMode != 'ALL':
+                        self.stopReason = 'found' if self.searchMode == 'FAST' else 'completed'
+                        return
+                if self.stopReason is not None:
+                    return
+        except GeneratorExit:
+            # the caller stopped consuming the crosswords
+            if self.stopReason is None:
+                self.stopReason = 'closed'
+            raise
+        finally:
+            if self.stopReason is None:
+                self.stopReason = 'completed'
+
+    def bestCrosswords(self):
+        '''
+        Runs the search until it completes or stops early, keeping only the smallest crosswords found.
+        :return: list - the smallest crosswords found (empty if none was found)
+        '''
+        best = []
+        for crossword in self.search():
+            if not best or crossword.getSize() < best[0].getSize():
+                best = [crossword]
+            elif crossword.getSize() == best[0].getSize():
+                best.append(crossword)
+        return best
+
+    def searchFrame(self, frameSize, exactSize):
+        '''
+        Builds the options of a frame and searches it. The budgets are checked while the options are built, and a
+        frame with more than "maxOptions" options is not searched (the search stops).
+        :param frameSize: int - number of rows and columns of the frame
+        :param exactSize: bool - if True, search for the crosswords of exactly the frame size that touch its top and
+                                 left edges; if False, search for every crossword with the first word starting at
+                                 the centre of the frame
+        :return: generator of the valid, unique crosswords found in the frame
+        '''
+        positionsCount = frameSize * frameSize
+        if self.countOptions(frameSize) > self.maxOptions:
+            self.stopReason = 'tooLarge'
+            return
+        # option p places word optionWords[p] in orientation optionOrientations[p], with its letters
+        # optionLetters[p] ((index, character code) tuples) and its blank ends optionBlanks[p]; optionEdges[p] has
+        # bit 0 set if it has a letter on the top edge, bit 1 on the left edge, bit 2 on the bottom or right edge
+        self.optionWords = []
+        self.optionOrientations = []
+        self.optionLetters = []
+        self.optionBlanks = []
+        self.optionEdges = []
+        # for every position, (option, character code or 0 for a blank end, orientation) of the options covering it,
+        # and for every word, its options
+        self.positionOptions = [[] for index in range(positionsCount)]
+        self.wordOptions = [[] for word in self.distinctWords]
+        for wordIndex, word in enumerate(self.distinctWords):
+            for orientation in (0, 1):
+                step = frameSize if orientation else 1
+                for row in range(frameSize - orientation * (len(word) - 1)):
+                    # if a budget has run out, or the search has been cancelled
+                    if self.checkBudget():
+                        return
+                    for col in range(frameSize - (1 - orientation) * (len(word) - 1)):
+                        firstIndex = row * frameSize + col
+                        lastIndex = firstIndex + (len(word) - 1) * step
+                        # if the option does not fit the maximum height and width
+                        if (self.maxHeight is not None and lastIndex // frameSize >= self.maxHeight) or \
+                                (self.maxWidth is not None and lastIndex % frameSize >= self.maxWidth):
+                            continue
+                        option = len(self.optionWords)
+                        letters = tuple([(firstIndex + i * step, ord(char)) for i, char in enumerate(word)])
+                        blanks = []
+                        if (col if orientation == 0 else row) > 0:
+                            blanks.append(firstIndex - step)
+                        if (lastIndex % frameSize if orientation == 0 else lastIndex // frameSize) < frameSize - 1:
+                            blanks.append(lastIndex + step)
+                        edges = (row == 0) | (col == 0) << 1
+                        if exactSize and (lastIndex // frameSize == frameSize - 1 or
+                                          lastIndex % frameSize == frameSize - 1):
+                            edges |= 4
+                        self.optionWords.append(wordIndex)
+                        self.optionOrientations.append(orientation)
+                        self.optionLetters.append(letters)
+                        self.optionBlanks.append(tuple(blanks))
+                        self.optionEdges.append(edges)
+                        self.wordOptions[wordIndex].append(option)
+                        for index, char in letters:
+                            self.positionOptions[index].append((option, char, orientation))
+                        for index in blanks:
+                            self.positionOptions[index].append((option, 0, orientation))
+        self.frameSize = frameSize
+        self.exactSize = exactSize
+        # colour of every position: 0 if free, 1 if blank, else the character code of its letter; and how many
+        # selected options colour it
+        self.colours = bytearray(positionsCount)
+        self.colourHolders = [0] * positionsCount
+        # positions taken by a letter of a selected option, per orientation
+        self.taken = (bytearray(positionsCount), bytearray(positionsCount))
+        self.active = bytearray(b'\x01') * len(self.optionWords)
+        self.activeCounts = [0] * len(self.distinctWords)
+        for wordIndex in self.optionWords:
+            self.activeCounts[wordIndex] += 1
+        self.remainingCounts = self.wordCounts.copy()
+        # active options of every word, and letters on the board, on the top, left and bottom-or-right edges
+        self.activeEdges = [[0, 0, 0] for word in self.distinctWords]
+        for wordIndex, edges in zip(self.optionWords, self.optionEdges):
+            for edge in range(3):
+                self.activeEdges[wordIndex][edge] += edges >> edge & 1
+        self.edgeLetters = [0, 0, 0]
+        self.letterPositions = []
+        self.selectedOptions = []
+        self.expandedStates = set()
+        centreIndex = (frameSize // 2) * frameSize + frameSize // 2
+        # a frame that is not square does not hold the transposes of its crosswords, so the first word is also
+        # placed 'down'
+        anchorOrientations = (0,) if self.maxHeight == self.maxWidth else (0, 1)
+        for option in self.wordOptions[self.anchorWord]:
+            if self.optionOrientations[option] in anchorOrientations and \
+                    (exactSize or self.optionLetters[option][0][0] == centreIndex):
+                discarded = self.selectOption(option)
+                if discarded is not None:
+                    yield from self.dfs(1 << option)
+                    self.unselectOption(option, discarded)
+                if self.stopReason is not None:
+                    return
+
+    def countOptions(self, frameSize):
+        '''
+        :param frameSize: int - number of rows and columns of a frame
+        :return: int - number of options of the frame (see "searchFrame")
+        '''
+        optionsCount = 0
+        for word in self.distinctWords:
+            for orientation in (0, 1):
+                rows = min(frameSize, self.maxHeight or frameSize) - orientation * (len(word) - 1)
+                cols = min(frameSize, self.maxWidth or frameSize) - (1 - orientation) * (len(word) - 1)
+                optionsCount += max(rows, 0) * max(cols, 0)
+        return optionsCount
+
+    def selectOption(self, option):
+        '''
+        Places an option on the board and discards the options that no longer agree with it.
+        :param option: int - an active option
+        :return: list - the discarded options (to pass to "unselectOption"), or None if the board is left with a
+                        remaining word that has too few options or an edge that can no longer be reached; the option
+                        is then already unselected
+        '''
+        colours = self.colours
+        orientation = self.optionOrientations[option]
+        changedPositions = []
+        for index, char in self.optionLetters[option]:
+            if not self.colours[index]:
+                colours[index] = char
+                changedPositions.append(index)
+                self.letterPositions.append(index)
+                self.countEdgeLetter(index, 1)
+            self.colourHolders[index] += 1
+            self.taken[orientation][index] = 1
+        for index in self.optionBlanks[option]:
+            if not colours[index]:
+                colours[index] = 1
+                changedPositions.append(index)
+            self.colourHolders[index] += 1
+        self.selectedOptions.append(option)
+        discarded = []
+        self.discardOption(option, discarded)
+        # once a word is covered as many times as it appears, its other options are of no use (they are left active,
+        # but never selected nor counted)
+        self.remainingCounts[self.optionWords[option]] -= 1
+        # the letter positions of the option can no longer be taken by another option in the same orientation
+        for index, char in self.optionLetters[option]:
+            for otherOption, otherChar, otherOrientation in self.positionOptions[index]:
+                if self.active[otherOption] and otherChar and otherOrientation == orientation:
+                    self.discardOption(otherOption, discarded)
+        # the positions it coloured can only be covered by options of the same colour
+        for index in changedPositions:
+            colour = colours[index]
+            for otherOption, otherChar, otherOrientation in self.positionOptions[index]:
+                if self.active[otherOption] and (otherChar or 1) != colour:
+                    self.discardOption(otherOption, discarded)
+        # if a remaining word has fewer options left than times it must still be covered
+        for wordIndex, remainingCount in enumerate(self.remainingCounts):
+            if self.activeCounts[wordIndex] < remainingCount:
+                self.unselectOption(option, discarded)
+                return None
+        # if the crossword can no longer touch an edge it must touch
+        for edge in range(3 if self.exactSize else 0):
+            if not self.edgeLetters[edge] and not any([self.activeEdges[wordIndex][edge]
+                                                       for wordIndex, remainingCount in
+                                                       enumerate(self.remainingCounts) if remainingCount]):
+                self.unselectOption(option, discarded)
+                return None
+        return discarded
+
+    def unselectOption(self, option, discarded):
+        '''
+        Takes an option off the board and restores the options it discarded.
+        :param option: int - the last option selected
+        :param discarded: list - the options discarded when it was selected
+        :return: None
+        '''
+        for otherOption in reversed(discarded):
+            self.active[otherOption] = 1
+            self.activeCounts[self.optionWords[otherOption]] += 1
+            if self.optionEdges[otherOption]:
+                for edge in range(3):
+                    self.activeEdges[self.optionWords[otherOption]][edge] += self.optionEdges[otherOption] >> edge & 1
+        self.remainingCounts[self.optionWords[option]] += 1
+        self.selectedOptions.pop()
+        orientation = self.optionOrientations[option]
+        for index, char in self.optionLetters[option]:
+            self.colourHolders[index] -= 1
+            self.taken[orientation][index] = 0
+            if not self.colourHolders[index]:
+                self.colours[index] = 0
+                self.letterPositions.pop()
+                self.countEdgeLetter(index, -1)
+        for index in self.optionBlanks[option]:
+            self.colourHolders[index] -= 1
+            if not self.colourHolders[index]:
+                self.colours[index] = 0
+
+    def discardOption(self, option, discarded):
+        '''
+        :param option: int - an active option
+        :param discarded: list - the options discarded so far, which option is added to
+        :return: None
+        '''
+        self.active[option] = 0
+        self.activeCounts[self.optionWords[option]] -= 1
+        if self.optionEdges[option]:
+            for edge in range(3):
+                self.activeEdges[self.optionWords[option]][edge] -= self.optionEdges[option] >> edge & 1
+        discarded.append(option)
+
+    def countEdgeLetter(self, index, change):
+        '''
+        :param index: int - position of a letter added to (or taken off) the board
+        :param change: int - 1 if the letter was added, -1 if it was taken off
+        :return: None
+        '''
+        row, col = divmod(index, self.frameSize)
+        if row == 0:
+            self.edgeLetters[0] += change
+        if col == 0:
+            self.edgeLetters[1] += change
+        if row == self.frameSize - 1 or col == self.frameSize - 1:
+            self.edgeLetters[2] += change
+
+    def checkBudget(self):
+        '''
+        Stops the search if the node budget or the time budget has run out, or the search has been cancelled.
+        :return: bool - True if the search has been stopped
+        '''
+        if self.cancelEvent is not None and self.cancelEvent.is_set():
+            self.stopReason = 'cancelled'
+        elif self.maxNodes is not None and self.nodesExpanded >= self.maxNodes:
+            self.stopReason = 'maxNodes'
+        elif self.deadline is not None and time.monotonic() >= self.deadline:
+            self.stopReason = 'maxSeconds'
+        return self.stopReason is not None
+
+    def dfs(self, stateKey):
+        '''
+        Depth first search over the options that cross the words already placed, the options of the words with the
+        fewest options left first. Different selection orders lead to the same sets of options, so each set is only
+        expanded once per frame.
+        :param stateKey: int - bitmask of the selected options
+        :return: generator of Crossword objects
+        '''
+        if stateKey in self.expandedStates:
+            return
+        self.expandedStates.add(stateKey)
+
+        # if a budget has run out, or the search has been cancelled
+        self.nodesExpanded += 1
+        if not self.nodesExpanded % self.checkInterval and self.checkBudget():
+            return
+
+        # if every word is placed
+        if not any(self.remainingCounts):
+            crossword = self.buildCrossword()
+            if crossword is not None:
+                yield crossword
+            return
+
+        # the active options with a letter on a letter of the board
+        crossingOptions = set()
+        for index in self.letterPositions:
+            for option, char, orientation in self.positionOptions[index]:
+                if char and self.active[option] and self.remainingCounts[self.optionWords[option]]:
+                    crossingOptions.add(option)
+        for option in sorted(crossingOptions, key=lambda option: (self.activeCounts[self.optionWords[option]],
+                                                                  option)):
+            # an option discarded by a sibling's subtree is restored when the sibling is unselected
+            discarded = self.selectOption(option)
+            if discarded is not None:
+                yield from self.dfs(stateKey | 1 << option)
+                self.unselectOption(option, discarded)
+            if self.stopReason is not None:
+                return
+
+    def buildCrossword(self):
+        '''
+        Builds the Crossword of the selected options, inserting the words in the order they were selected (each one
+        crosses a word selected before it).
+        :return: Crossword object if the crossword is valid and has not been discovered yet, None otherwise
+        '''
+        placements = [(self.distinctWords[self.optionWords[option]],
+                       divmod(self.optionLetters[option][0][0], self.frameSize), self.optionOrientations[option])
+                      for option in self.selectedOptions]
+        crossword = crosswordFromPlacements(placements)
+        # if crossword is valid and unique (a crossword and its transpose have the same fingerprint)
+        if crossword is None or not crossword.isValid():
+            return None
+        fingerprint = crossword.getFingerprint()
+        if fingerprint in self.alreadyDiscovered:
+            return None
+        self.alreadyDiscovered.add(fingerprint)
+        return crossword
+
+
+# search engines, by name. Every engine is a class taking the words (and its own settings as keyword arguments),
+# with a "search" generator of Crossword objects, a "bestCrosswords" method, and "stopReason", "infeasibility" and
+# "nodesExpanded" attributes; "searchParameters" lists the settings of "generateCrosswords" it takes
+searchEngines = {'dfs': CrosswordSearch, 'exactCover': ExactCoverSearch, 'beam': BeamSearch}
+
+
+def generateCrosswords(words, searchMode='ALL', orderIndependent=True, workers=1, engine='dfs', **searchOptions):
+    '''
+    Yields each valid, unique crossword arrangement of words as soon as it is found; see "CrosswordSearch".
+    Stopping the iteration stops the search.
+    :param words: list - words to be inserted into the crossword, in any order and case
+    :param searchMode: str - 'ALL', 'FAST' or 'IDEAL'
+    :param orderIndependent: bool - if True, search over the set of words not yet inserted
+    :param workers: int - number of processes to spread the search over
+    :param engine: str - name of the search engine in "searchEngines"; searchMode, orderIndependent and workers are
+                         only passed on to the engines that take them
+    :param searchOptions: other settings, passed on to the engine (budgets, cancellation token, progress callback...)
+    :return: generator of Crossword objects
+    '''
+    engineClass = searchEngines[engine]
+    settings = {'searchMode': searchMode, 'orderIndependent': orderIndependent, 'workers': workers}
+    for parameter in engineClass.searchParameters:
+        searchOptions[parameter] = settings[parameter]
+    return engineClass(words, **searchOptions).search()
+
+
+def profileSearch(search, reportPath, traceMemory=False, topCount=30):
+    '''
+    Runs a search to completion under cProfile (and, optionally, tracemalloc), and writes a report of where it spent its
+    time and memory to a text file. Profiling slows the search down several times, so the report shows where the time
+    goes, not how long the search takes.
+    :param search: search engine object (e.g. "CrosswordSearch"; created with collectStats=True to add its counters)
+    :param reportPath: str - path of the report file
+    :param traceMemory: bool - if True, also report the lines that allocated the most memory
+    :param topCount: int - number of functions / lines to report
+    :return: list - the crosswords found
+    '''
+    # imported here, as they take longer to import than the rest of the module
+    import cProfile
+    import pstats
+    import tracemalloc
+    profiler = cProfile.Profile()
+    if traceMemory:
+        tracemalloc.start()
+    profiler.enable()
+    try:
+        crosswords = list(search.search())
+    finally:
+        profiler.disable()
+        memorySnapshot = tracemalloc.take_snapshot() if traceMemory else None
+        peakMemoryBytes = tracemalloc.get_traced_memory()[1] if traceMemory else None
+        if traceMemory:
+            tracemalloc.stop()
+    with open(reportPath, 'w') as reportFile:
+        reportFile.write('Search: ' + type(search).__name__ + ', stopped: ' + str(search.stopReason) + '\n')
+        reportFile.write('Crosswords found: ' + str(len(crosswords)) + '\n')
+        reportFile.write('Partial crosswords expanded: ' + str(search.nodesExpanded) + '\n')
+        # if the search collected its counters
+        if getattr(search, 'stats', None) is not None:
+            reportFile.write('\nCounters:\n')
+            for counter, value in search.stats.asDict().items():
+                reportFile.write('  ' + counter + ': ' + str(value) + '\n')
+        reportFile.write('\nFunctions by cumulative time:\n')
+        pstats.Stats(profiler, stream=reportFile).sort_stats('cumulative').print_stats(topCount)
+        if traceMemory:
+            reportFile.write('Peak traced memory: ' + str(peakMemoryBytes) + ' bytes\n')
+            reportFile.write('\nLines by memory still allocated at the end of the search:\n')
+            for statistic in memorySnapshot.statistics('lineno')[:topCount]:
+                reportFile.write('  ' + str(statistic) + '\n')
+    return crosswords
+
+
+def initializeWorker(words, searchMode, orderIndependent, sharedBestSize, sharedStopSearch, sharedNodes, maxNodes,
+                     deadline, heuristicOrder, collectStats):
+    '''
+    Sets up the search of a worker process of the parallel search.
+    :param words: list - words to be inserted into the crossword
+    :param searchMode: str - 'ALL', 'FAST' or 'IDEAL'
+    :param orderIndependent: bool - True for the order-independent search
+    :param sharedBestSize: multiprocessing.RawValue - smallest size found by any process (0 if none yet)
+    :param sharedStopSearch: multiprocessing.RawValue - set to 1 once the search should stop
+    :param sharedNodes: multiprocessing.Value - partial crosswords expanded by all the processes
+    :param maxNodes: int - node budget of the whole search (None for no budget)
+    :param deadline: float - time.monotonic() value at which the search stops (None for no time budget)
+    :param heuristicOrder: bool - True to try the most constrained words first
+    :param collectStats: bool - True to count where the search spends its effort
+    :return: None
+    '''
+    global workerSearch
+    workerSearch = CrosswordSearch(words, searchMode=searchMode, orderIndependent=orderIndependent,
+                                   maxNodes=maxNodes, heuristicOrder=heuristicOrder, collectStats=collectStats)
+    workerSearch.bestSize = sharedBestSize
+    workerSearch.stopSearch = sharedStopSearch
+    workerSearch.sharedNodes = sharedNodes
+    workerSearch.deadline = deadline
+
+
+def searchSubtrees(crosswords):
+    '''
+    Task of a worker process: searches the subtrees below a list of seed crosswords. The worker keeps its search (and
+    so its "alreadyDiscovered" and "expandedStates") between tasks, so it only returns crosswords it has not returned
+    before.
+    :param crosswords: list - the Crossword objects at the roots of the subtrees
+    :return: tuple - (number of subtrees searched, list of the valid, unique crosswords found in them, SearchStats
+                      object counting the effort of this task, or None if the search does not collect its counters)
+    '''
+    taskStats = None
+    if workerSearch.stats is not None:
+        # count this task only, as the parent adds up the counters of every task
+        workerSearch.stats = SearchStats()
+        taskStartTime = time.perf_counter()
+    foundCrosswords = []
+    for crossword in crosswords:
+        foundCrosswords += workerSearch.searchSubtree(crossword)
+    workerSearch.flushNodes()
+    if workerSearch.stats is not None:
+        taskStats = workerSearch.stats
+        taskStats.phaseSeconds['workerSearch'] += time.perf_counter() - taskStartTime
+    return len(crosswords), foundCrosswords, taskStats
+
+
+if __name__ == '__main__':
+    wordsList = ['david', 'selma', 'alex', 'quique', 'mamita']
+    # if True, search over the set of words not yet inserted instead of running a DFS for every permutation of wordsList
+    orderIndependent = True
+    # 'ALL' to find every arrangement, 'FAST' to stop at the first one, 'IDEAL' to search only for arrangements
+    # smaller than the smallest one found so far
+    searchMode = 'ALL'
+    # number of processes to spread the search over; 1 runs the search in this process
+    workers = 1
+    # if True, start from the most constrained word, and try the most constrained words first
+    heuristicOrder = False
+    # stop early after this many partial crosswords / seconds (None for no limit)
+    maxNodes = None
+    maxSeconds = None
+    # only search for crosswords that fit this many rows / columns, as they are or transposed (None for no limit)
+    maxHeight = None
+    maxWidth = None
+    # if True, print where the search spent its effort (see "SearchStats"); profileSearch gives a finer report
+    collectStats = False
+
+    # execute the search, storing each crossword in validCrosswords according to its size
+    startTime = time.time()
+    crosswordSearch = CrosswordSearch(wordsList, searchMode=searchMode, orderIndependent=orderIndependent,
+                                      workers=workers, maxNodes=maxNodes, maxSeconds=maxSeconds,
+                                      heuristicOrder=heuristicOrder, maxHeight=maxHeight, maxWidth=maxWidth,
+                                      collectStats=collectStats)
+    validCrosswords = {}
+    for crossword in crosswordSearch.search():
+        try:
+            validCrosswords[crossword.getSize()].append(crossword)
+        except KeyError:
+            validCrosswords[crossword.getSize()] = [crossword]
+            # if new smallest crossword discovered, print it
+            if crossword.getSize() == min(validCrosswords):
+                print('Smallest crossword discovered so far:')
+                crossword.printCrossword()
 
-    # if crossword is not yet complete
-    for index, char in enumerate(crossword.getWordsToInsert()[0]):
-        for existingLetterPosition in crossword.getLettersDict()[char].copy():
-            # insert 'across'
-            dfs(Crossword(parentCrossword=crossword,
-                          insertPosition=(existingLetterPosition[0], existingLetterPosition[1] - index),
-                          insertOrientation=0))
-            # insert 'down'
-            dfs(Crossword(parentCrossword=crossword,
-                          insertPosition=(existingLetterPosition[0] - index, existingLetterPosition[1]),
-                          insertOrientation=1))
-    return
-
-
-# execute DFS function for each unique order of words to be inserted
-startTime = time.time()
-for i in range(len(wordsList)):
-    wordsList[i] = wordsList[i].upper()
-wordsList.sort()
-wordsSet = set(wordsList)
-validCrosswords = {}
-alreadyDiscovered = []
-for perm in itertools.permutations(wordsList):
-    dfs(Crossword(wordsList=list(perm)))
-
-# print results
-sortedValidCrosswords = {i:validCrosswords[i] for i in sorted(list(validCrosswords.keys()))}
-sizes = list(sortedValidCrosswords.keys())
-arrangements = []
-count = 0
-print('\nProcess completed.\n')
-for i in sortedValidCrosswords:
-    arrangements.append(len(sortedValidCrosswords[i]))
-    for j in sortedValidCrosswords[i]:
-        j.printCrossword()
-        count += 1
-arrangementsPerSizeDict = {'Size':sizes, 'Arrangements':arrangements}
-df = pd.DataFrame(data=arrangementsPerSizeDict).to_string(index=False)
-print(df)
-print('\nTotal arrangements:', count)
-print('(' + str(round(time.time() - startTime, 2)) + ' seconds)')
\ No newline at end of file
+    # print results
+    sortedValidCrosswords = {i:validCrosswords[i] for i in sorted(list(validCrosswords.keys()))}
+    sizes = list(sortedValidCrosswords.keys())
+    arrangements = []
+    count = 0
+    if crosswordSearch.stopReason == 'infeasible':
+        print('\nNo possible crossword arrangements (' + crosswordSearch.infeasibility + ').\n')
+    elif crosswordSearch.stopReason in ('maxNodes', 'maxSeconds'):
+        print('\nSearch stopped early (' + crosswordSearch.stopReason + ' reached).\n')
+    else:
+        print('\nProcess completed.\n')
+    for i in sortedValidCrosswords:
+        arrangements.append(len(sortedValidCrosswords[i]))
+        for j in sortedValidCrosswords[i]:
+            j.printCrossword()
+            count += 1
+    arrangementsPerSizeDict = {'Size':sizes, 'Arrangements':arrangements}
+    print(crosswordRender.renderTable(arrangementsPerSizeDict))
+    print('\nTotal arrangements:', count)
+    print('Partial crosswords expanded:', crosswordSearch.sharedNodes.value)
+    if crosswordSearch.stats is not None:
+        for counter, value in crosswordSearch.stats.asDict().items():
+            print(counter + ':', value)
+    print('(' + str(round(time.time() - startTime, 2)) + ' seconds)')
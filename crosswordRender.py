@@ -0,0 +1,114 @@
+import json
+import struct
+
+# output formats of "writeCrosswords"
+outputFormats = ('text', 'json', 'binary')
+# codes of the cells of the binary form: 0 for a blank position, 1-26 for the letters A-Z
+binaryCodes = bytes.maketrans(b' ABCDEFGHIJKLMNOPQRSTUVWXYZ', bytes(range(27)))
+binaryLetters = bytes.maketrans(bytes(range(27)), b' ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+# header of the binary form: height and width, as big-endian unsigned shorts
+binaryHeader = struct.Struct('>HH')
+
+
+def renderText(crossword, spaced=True):
+    '''
+    :param crossword: Crossword object - the crossword
+    :param spaced: bool - if True, the positions of a row are separated by spaces (as "printCrossword" prints them)
+    :return: str - the rows of the crossword, one per line, with blank positions as ' '
+    '''
+    rowBytes = crossword.getRowBytes()
+    if spaced:
+        return '\n'.join([' '.join(row.decode()) for row in rowBytes])
+    return b'\n'.join(rowBytes).decode()
+
+
+def renderDict(crossword):
+    '''
+    :param crossword: Crossword object - the crossword
+    :return: dict - 'size', 'height', 'width', 'rows' (with blank positions as ' ') and 'words': [word, [row, col],
+                    'across' or 'down'] of every word, in the order it was inserted, with the top left position at
+                    [0, 0]
+    '''
+    rowBytes = crossword.getRowBytes()
+    return {'size': crossword.getSize(), 'height': len(rowBytes), 'width': len(rowBytes[0]),
+            'rows': [row.decode() for row in rowBytes],
+            'words': [[word, [row - crossword.getMinRow(), col - crossword.getMinCol()],
+                       'down' if orientation else 'across']
+                      for word, (row, col), orientation in crossword.getPlacedWords()]}
+
+
+def renderJson(crossword):
+    '''
+    :param crossword: Crossword object - the crossword
+    :return: str - "renderDict" of the crossword, as one line of JSON
+    '''
+    return json.dumps(renderDict(crossword), separators=(',', ':'))
+
+
+def renderBinary(crossword):
+    '''
+    Compact binary form of a crossword: the header (height and width), then every position, row by row, as a 5-bit
+    code ("binaryCodes"), packed 8 positions to 5 bytes (the last group padded with blank positions).
+    :param crossword: Crossword object - the crossword
+    :return: bytes - the binary form
+    '''
+    rowBytes = crossword.getRowBytes()
+    codes = b''.join(rowBytes).translate(binaryCodes)
+    codes += bytes(-len(codes) % 8)
+    packed = bytearray(binaryHeader.pack(len(rowBytes), len(rowBytes[0])))
+    for start in range(0, len(codes), 8):
+        group = 0
+        for code in codes[start:start + 8]:
+            group = group << 5 | code
+        packed += group.to_bytes(5, 'big')
+    return bytes(packed)
+
+
+def decodeBinary(data):
+    '''
+    :param data: bytes - binary form of a crossword (see "renderBinary")
+    :return: tuple - rows of the crossword as strings, with blank positions as ' '
+    '''
+    height, width = binaryHeader.unpack_from(data)
+    codes = bytearray()
+    for start in range(binaryHeader.size, len(data), 5):
+        group = int.from_bytes(data[start:start + 5], 'big')
+        codes += bytes([group >> shift & 31 for shift in range(35, -1, -5)])
+    letters = bytes(codes[:height * width]).translate(binaryLetters).decode()
+    return tuple(letters[row * width:(row + 1) * width] for row in range(height))
+
+
+def writeCrosswords(crosswords, outputFile, outputFormat='text'):
+    '''
+    Writes crosswords as they come, without holding them in memory.
+    :param crosswords: iterable of Crossword objects (e.g. a search generator)
+    :param outputFile: file object - where the crosswords are written; opened in binary mode for the binary format
+    :param outputFormat: str - 'text' (the rows of each crossword, then a blank line), 'json' (one JSON object per
+                         line, see "renderDict") or 'binary' (each binary form preceded by its length as a big-endian
+                         unsigned int)
+    :return: int - number of crosswords written
+    '''
+    if outputFormat not in outputFormats:
+        raise ValueError('unknown output format: ' + str(outputFormat))
+    count = 0
+    for crossword in crosswords:
+        if outputFormat == 'text':
+            outputFile.write(renderText(crossword) + '\n\n')
+        elif outputFormat == 'json':
+            outputFile.write(renderJson(crossword) + '\n')
+        else:
+            data = renderBinary(crossword)
+            outputFile.write(struct.pack('>I', len(data)) + data)
+        count += 1
+    return count
+
+
+def renderTable(columns):
+    '''
+    :param columns: dict - values of each column, by column name
+    :return: str - the columns as a plain text table: a line of names, then one line per row, right-aligned
+    '''
+    names = list(columns)
+    cells = [names] + [[str(value) for value in row] for row in zip(*columns.values())]
+    widths = [max([len(cellRow[column]) for cellRow in cells]) for column in range(len(names))]
+    return '\n'.join(['  '.join([cell.rjust(width) for cell, width in zip(cellRow, widths)]) for cellRow in cells])